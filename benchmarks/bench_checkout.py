@@ -0,0 +1,258 @@
+"""Benchmarks of scaled mall checkout simulations
+
+Runs ``examples/mall_checkout.py`` headless with scaled arrival rates and
+checkout counts, each scenario in its own process, together with micro
+benchmarks of container drawing and state changes.
+
+Usage::
+
+    python benchmarks/bench_checkout.py --save
+    python benchmarks/bench_checkout.py --tolerance 0.15
+
+Results are compared against the JSON baseline (``--baseline``), the script
+exits with status 1 when any metric regressed more than the tolerance.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+import timeit
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "examples"))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame  # noqa: E402
+
+from pygsim.core import GSimulation  # noqa: E402
+from pygsim.drawing import GShape, GShapeType, DefaultColors  # noqa: E402
+from pygsim.drawing.container import (  # noqa: E402
+    GContainerRow,
+    GcontainerGrid,
+    GFillDirection,
+    GOverflow,
+)
+from pygsim.profiler import GFrameProfiler  # noqa: E402
+
+import mall_checkout  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Metrics where a higher value is better, all others are better when lower
+HIGHER_IS_BETTER = ("events_per_second", "frames_per_second", "calls_per_second")
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Peak resident memory of the current process
+
+    :return: Megabytes, None where not available (Windows)
+    :rtype: Optional[float]
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, other systems kilobytes
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(arrival_rate: float, checkouts: int, until: float) -> Dict[str, Any]:
+    """Runs one headless checkout simulation
+
+    :param arrival_rate: Customers arriving per simulation time unit
+    :type arrival_rate: float
+    :param checkouts: Count of checkouts
+    :type checkouts: int
+    :param until: Simulation run length
+    :type until: float
+    :return: Measured metrics
+    :rtype: Dict[str, Any]
+    """
+    env = GSimulation(resolution=(1000, 1000), headless=True, seed=0)
+    env.profiler = GFrameProfiler(window=100000)
+    mall_checkout.build_mall(env, checkout_count=checkouts, occurance=1 / arrival_rate)
+
+    start = time.perf_counter()
+    env.run(until=until)
+    elapsed = time.perf_counter() - start
+
+    metrics = {
+        "wall_time": elapsed,
+        "events": env.event_count,
+        "events_per_second": env.event_count / elapsed,
+        "frames_per_second": env.frame_count / elapsed,
+        "draw_time": {
+            name: t for name, t in env.profiler.by_type().items()  # type: ignore
+        },
+    }
+    peak = peak_memory_mb()
+    if peak is not None:
+        metrics["peak_memory_mb"] = peak
+    return metrics
+
+
+def _filled(container, count: int):
+    shape = GShape(GShapeType.Circle, 10, -1, DefaultColors.Yellow._get_color)
+    env = GSimulation(headless=True)
+    objects = [
+        mall_checkout.CustomerObject(env, None, {}, shape=shape) for _ in range(count)
+    ]
+    for o in objects:
+        container.enter(o)
+    return container, objects
+
+
+def run_micro(number: int) -> Dict[str, Dict[str, float]]:
+    """Micro benchmarks of container drawing and state changes
+
+    :param number: Repetition count of each benchmark
+    :type number: int
+    :return: Calls per second of each benchmark
+    :rtype: Dict[str, Dict[str, float]]
+    """
+    pygame.init()
+    screen = pygame.Surface((1000, 1000))
+
+    row, _ = _filled(
+        GContainerRow(
+            size=(900, 75),
+            position=(50, 50),
+            fill_direction=GFillDirection.Left,
+            overflow=GOverflow.Hidden,
+        ),
+        60,
+    )
+    grid, objects = _filled(
+        GcontainerGrid(size=(900, 800), position=(50, 150)),
+        1000,
+    )
+    # State mapper iterates over member names
+    states = [mall_checkout.CustomerState[n] for n in mall_checkout.CustomerState]
+
+    def state_change():
+        for i, o in enumerate(objects):
+            o.current_state = states[i % len(states)]
+        states.append(states.pop(0))
+
+    def enter_leave():
+        o = objects[0]
+        grid.leave(o)
+        grid.enter(o)
+
+    benches: Dict[str, Tuple[Callable[[], None], int]] = {
+        "row_draw_60": (lambda: row.draw(screen, 0.0), number),
+        "grid_draw_1000": (lambda: grid.draw(screen, 0.0), max(number // 10, 1)),
+        "state_change_1000": (state_change, max(number // 10, 1)),
+        "grid_enter_leave_1000": (enter_leave, number),
+    }
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, (bench, n) in benches.items():
+        t = min(timeit.repeat(bench, number=n, repeat=3))
+        results[name] = {"calls_per_second": n / t}
+
+    return results
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compares results against the baseline
+
+    :param results: Current results
+    :type results: Dict[str, Any]
+    :param baseline: Baseline results
+    :type baseline: Dict[str, Any]
+    :param tolerance: Allowed relative slow down, e.g. 0.1 for 10 %
+    :type tolerance: float
+    :return: Descriptions of regressed metrics
+    :rtype: List[str]
+    """
+    regressions: List[str] = []
+
+    def walk(current: Dict[str, Any], base: Dict[str, Any], path: str):
+        for key, base_value in base.items():
+            if key not in current:
+                continue
+            value = current[key]
+            name = f"{path}.{key}" if path else key
+            if isinstance(base_value, dict):
+                walk(value, base_value, name)
+                continue
+            if key in ("events", "wall_time") or base_value == 0:
+                continue
+            change = (value - base_value) / base_value
+            if key in HIGHER_IS_BETTER:
+                change = -change
+            marker = ""
+            if change > tolerance:
+                regressions.append(f"{name}: {base_value:.4g} -> {value:.4g}")
+                marker = "  REGRESSION"
+            print(f"{name:>60}: {base_value:12.4g} -> {value:12.4g}{marker}")
+
+    walk(results, baseline, "")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--arrival-rates", type=float, nargs="+", default=[1.5, 6, 24])
+    parser.add_argument("--checkouts", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--until", type=float, default=300.0)
+    parser.add_argument("--micro-number", type=int, default=200)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Store as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    scenarios = [(r, c) for r in args.arrival_rates for c in args.checkouts]
+    results: Dict[str, Any] = {"scenarios": {}, "micro": {}}
+
+    # Fresh process per scenario, so peak memory is measured separately
+    context = multiprocessing.get_context("spawn")
+    for rate, checkouts in scenarios:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            metrics = executor.submit(run_scenario, rate, checkouts, args.until)
+            name = f"rate_{rate:g}_checkouts_{checkouts}"
+            results["scenarios"][name] = metrics.result()
+            print(
+                f"{name}: {metrics.result()['events_per_second']:.0f} events/s, "
+                f"{metrics.result()['frames_per_second']:.1f} frames/s"
+            )
+
+    results["micro"] = run_micro(args.micro_number)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline stored in {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(json.dumps(results, indent=2, sort_keys=True))
+        print(f"No baseline in {args.baseline}, run with --save to create it")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metrics regressed over {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+import pygame
+
+from pygsim.drawing import GStateColorMapper, GEntityStore, GShapeType
+from pygsim.core import GSimulation, GSimulationSpeed
+
+
+class AgentState(GStateColorMapper):
+    Idle = "#00ff00"
+    Busy = "#ff0000"
+    Done = 2
+
+
+def agents_life_cycle(env: GSimulation, agents: GEntityStore, area: pygame.Rect):
+    rng = env.streams.generator("agents")
+    while True:
+        yield env.timeout(0.1)
+
+        # Transitions of whole states at once
+        idle = agents.select(AgentState.Idle)
+        agents.set_state(idle[rng.random(len(idle)) < 0.05], AgentState.Busy)
+        busy = agents.select(AgentState.Busy)
+        agents.set_state(busy[rng.random(len(busy)) < 0.1], AgentState.Done)
+
+        # Finished agents are replaced by new ones
+        done = agents.select(AgentState.Done)
+        finished = done[rng.random(len(done)) < 0.05]
+        if len(finished) > 0:
+            agents.remove(finished)
+            agents.add(len(finished))
+            agents.arrange(area, spacing=1)
+
+
+if __name__ == "__main__":
+    env = GSimulation(
+        resolution=(1000, 1000),
+        simulation_speed=GSimulationSpeed.Real,
+        debug_show=True,
+        dirty_rendering=True,
+    )
+
+    area = pygame.Rect(10, 100, 980, 890)
+    agents = GEntityStore(AgentState, shape_type=GShapeType.Circle, size=3)
+    agents.add(50000)
+    agents.arrange(area, spacing=1)
+    env.add_drawable(agents)
+
+    env.process(agents_life_cycle(env, agents, area))
+
+    env.run()
@@ -1,6 +1,5 @@
 from typing import Optional, List, Tuple, Dict
 from simpy.events import Event
-import random
 
 from pygsim.drawing import (
     GStateColorMapper,
@@ -112,6 +111,10 @@ class CheckoutObject(GSimulationObject):
             2,
         )
 
+    # Area covered by custom drawing, used by dirty rectangle rendering
+    def bounds(self, screen) -> pygame.rect.Rect:
+        return self._checkout_rect
+
     def _process_customer(self):
         # Take customer out of line
         customer, event = self._queued_customers.pop(0)
@@ -124,8 +127,8 @@ class CheckoutObject(GSimulationObject):
 
         # Set customer state and wait for some time in checkout
         customer.current_state = CustomerState.Checkout
-        time_to_process = sum(
-            [random.uniform(0.02, 0.2) for _ in range(customer.items_bought)]
+        time_to_process = float(
+            self.rng.uniform(0.02, 0.2, customer.items_bought).sum()
         )
         yield self._env.timeout(time_to_process)
 
@@ -210,7 +213,9 @@ class CustomerObject(GSimulationObject):
         self._store = store
         self._container_dict = container_dict
         self._gender = (
-            GenderState.Male if random.uniform(0, 1) < 0.5 else GenderState.Female
+            GenderState.Male
+            if env.streams.draw("gender", "uniform") < 0.5
+            else GenderState.Female
         )
         self._items_bought = 0
         self._arrive_time = env.now
@@ -225,7 +230,7 @@ class CustomerObject(GSimulationObject):
         self._container_dict[f"{CustomerState.WalkingToShopping}"].enter(self)
 
         # Walk from store to shopping area
-        yield self._env.timeout(random.randrange(1, 5))
+        yield self._env.timeout(self._env.streams.draw("walk", "integers", 1, 5))
 
         # Remove customer from walking to shopping container
         self._container_dict[f"{CustomerState.WalkingToShopping}"].leave(self)
@@ -238,16 +243,16 @@ class CustomerObject(GSimulationObject):
 
         # Create random shopping time based on gender
         shoppping_time = (
-            random.triangular(3, 10, 25)
+            self.rng.triangular(3, 10, 25)
             if self._gender == GenderState.Male
-            else random.triangular(10, 20, 30)
+            else self.rng.triangular(10, 20, 30)
         )
 
         # Create random items bought based on gender
         self._items_bought = int(
-            random.triangular(1, 5, 15)
+            self.rng.triangular(1, 5, 15)
             if self._gender == GenderState.Male
-            else random.triangular(10, 20, 30)
+            else self.rng.triangular(10, 20, 30)
         )
 
         # Await customer to be done with shopping
@@ -263,7 +268,7 @@ class CustomerObject(GSimulationObject):
         self._container_dict[f"{CustomerState.WalkingToCheckout}"].enter(self)
 
         # Await customer to walk to checkout
-        yield self._env.timeout(random.randrange(1, 5))
+        yield self._env.timeout(self._env.streams.draw("walk", "integers", 1, 5))
 
         # Remove customer from walking to checkout container
         self._container_dict[f"{CustomerState.WalkingToCheckout}"].leave(self)
@@ -284,7 +289,7 @@ class CustomerObject(GSimulationObject):
         self._container_dict[f"{CustomerState.WalkingToExit}"].enter(self)
 
         # Await till customer walks out of store
-        yield self._env.timeout(random.randrange(1, 5))
+        yield self._env.timeout(self._env.streams.draw("walk", "integers", 1, 5))
 
         # Remove customer from walking to exit container
         self._container_dict[f"{CustomerState.WalkingToExit}"].leave(self)
@@ -298,20 +303,19 @@ class CustomerFactory(GFactoryObject):
     # Set factory type to infinite
     Type = FactoryType.Infinite  # type: ignore
 
-    # Set settings for distribution
-    Occurance = 0.7  # type: ignore
-
     def __init__(
         self,
         env: GSimulation,
         store: "StoreObject",
         container_dict: Dict[str, GContainerBase],
         *args,
+        occurance: float = 0.7,
         **kwargs,
     ) -> None:
         self._store = store
         self._container_dict = container_dict
-        super().__init__(env, *args, **kwargs)
+        # Set settings for distribution
+        super().__init__(env, *args, occurance=occurance, **kwargs)
 
     # Create customer objects
     def build(self):
@@ -336,7 +340,7 @@ class StoreObject(GFactoryObject):
 
     # Create checkouts and their containers
     def build(self):
-        w, _ = self._env._resolution
+        w, _ = self._env.resolution
         container_queue = GContainerRow(
             size=((int(w / 20) * 16) - 25, 75),
             position=(int(w / 20), 475 + (self._build_count * 75)),
@@ -376,8 +380,9 @@ class StoreObject(GFactoryObject):
     # Otherwise just choose the checkout with least of customers
     def get_checkout(self):
         checkouts = self._checkouts
+        # Busy checkouts are open as well, they just have a long queue
         open_checkouts = list(
-            filter(lambda c: c.current_state == CheckoutState.Open, checkouts)
+            filter(lambda c: c.current_state != CheckoutState.Closed, checkouts)
         )
 
         if len(open_checkouts) == 0:
@@ -405,25 +410,27 @@ class StoreObject(GFactoryObject):
         return None
 
     def open_closed_checkout(self):
-        checkout = random.choice(
-            list(
-                filter(
-                    lambda c: c.current_state == CheckoutState.Closed, self._checkouts
-                )
-            )
-        )
+        closed = [c for c in self._checkouts if c.current_state == CheckoutState.Closed]
+        checkout = closed[self.rng.integers(len(closed))]
         yield self._env.process(checkout.open_checkout())
         return checkout
 
 
-if __name__ == "__main__":
-    WINDOW_SIZE = (1000, 1000)
+def build_mall(
+    env: GSimulation, checkout_count: int = 5, occurance: float = 0.7
+) -> StoreObject:
+    """Creates the mall containers, store and customer factory
 
-    env = GSimulation(
-        simulation_speed=GSimulationSpeed.Faster,
-        resolution=WINDOW_SIZE,
-        debug_show=True,
-    )
+    :param env: Simulation to build the mall in
+    :type env: GSimulation
+    :param checkout_count: Count of checkouts, defaults to 5
+    :type checkout_count: int, optional
+    :param occurance: Mean time between customer arrivals, defaults to 0.7
+    :type occurance: float, optional
+    :return: Created store
+    :rtype: StoreObject
+    """
+    WINDOW_SIZE = env.resolution
 
     # WalkingToShopping = 0
     container_wts = GContainerRow(
@@ -500,8 +507,20 @@ if __name__ == "__main__":
         f"{CustomerState.WalkingToExit}": container_wte,
     }
 
-    store = StoreObject(env, checkout_count=5)
+    store = StoreObject(env, checkout_count=checkout_count)
+
+    CustomerFactory(env, store, container_map, occurance=occurance)
+
+    return store
+
+
+if __name__ == "__main__":
+    env = GSimulation(
+        simulation_speed=GSimulationSpeed.Faster,
+        resolution=(1000, 1000),
+        debug_show=True,
+    )
 
-    CustomerFactory(env, store, container_map)
+    build_mall(env)
 
     env.run()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+from pygsim.core import GSimulation
+from pygsim.replay import GTraceViewer
+from pygsim.trace import GTraceWriter
+
+from mall_checkout import build_mall
+
+TRACE_PATH = "mall_trace.npy"
+
+
+def record(until: float) -> None:
+    # Runs the model headless as fast as possible, recording the trace only
+    env = GSimulation(resolution=(1000, 1000), headless=True, render_every=0, seed=0)
+    with GTraceWriter(TRACE_PATH) as trace:
+        env.trace = trace
+        build_mall(env)
+        env.run(until=until)
+
+
+if __name__ == "__main__":
+    if "--record" in sys.argv or not os.path.exists(TRACE_PATH):
+        record(until=3600)
+
+    # Page up / down seek, home / end jump to the beginning / end
+    viewer = GTraceViewer(TRACE_PATH, resolution=(1000, 1000), debug_show=True)
+    viewer.run()
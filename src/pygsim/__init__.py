@@ -1,3 +1,29 @@
-from . import core, drawing, util
+from . import (
+    core,
+    drawing,
+    hud,
+    metrics,
+    profiler,
+    recorder,
+    replay,
+    replication,
+    statistics,
+    streams,
+    trace,
+    util,
+)
 
-__all__ = ["core", "drawing", "util"]
+__all__ = [
+    "core",
+    "drawing",
+    "hud",
+    "metrics",
+    "profiler",
+    "recorder",
+    "replay",
+    "replication",
+    "statistics",
+    "streams",
+    "trace",
+    "util",
+]
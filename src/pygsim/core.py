@@ -1,17 +1,32 @@
-from typing import List, Union, Optional, Callable, Any
+from typing import Dict, Iterable, Iterator, List, Union, Optional, Callable, Any, Tuple
+from contextlib import contextmanager
 from enum import Enum
 from itertools import count
 from abc import abstractmethod
-from numpy.random import exponential
+import asyncio
+import inspect
 import time
 
+import numpy as np
+
+from simpy.core import URGENT, EmptySchedule, Environment, Infinity
+from simpy.events import Event, Interrupt, Process, Timeout
 from simpy.rt import RealtimeEnvironment
 import pygame
 from pygame.surface import Surface
 
 from .drawing.color import GStateColorMapper, GStateColorMapperMeta
 from .drawing.drawable import GDrawable
+from .drawing.registry import GDrawHandle, GDrawRegistry, GLayer
 from .drawing.shape import GShape
+from .hud import GHud
+from .metrics import GMetricsServer
+from .profiler import GFrameProfiler
+from .recorder import GFrameRecorder
+from .statistics import GStateStatistics
+from .streams import GRandomStreams
+from .trace import GTraceWriter
+from .util import merge_rects
 
 
 class GSimulationSpeed(Enum):
@@ -22,6 +37,7 @@ class GSimulationSpeed(Enum):
     Fast = 5
     Faster = 10
     Fastest = 100
+    Max = 0
 
 
 def get_factor_from_speed(
@@ -36,7 +52,7 @@ def get_factor_from_speed(
     :raises ValueError: When invalid GSimulationSpeed is supplied.
     :raises ValueError: When supplied speed is either zero or negative.
     :raises ValueError: When other type than GSimulationSpeed, int or float supplied.
-    :return: Speed factor
+    :return: Speed factor, zero for unthrottled ``GSimulationSpeed.Max``
     :rtype: float
     """
     factor = 1.0
@@ -45,6 +61,8 @@ def get_factor_from_speed(
         values = [m.value for m in GSimulationSpeed]
         if simulation_speed.value not in values:
             raise ValueError("Invalid GSimulationSpeed simulation speed")
+        if simulation_speed == GSimulationSpeed.Max:
+            return 0.0
         factor = 1 / simulation_speed.value
     elif any([isinstance(simulation_speed, int), isinstance(simulation_speed, float)]):
         if simulation_speed <= 0:
@@ -56,6 +74,29 @@ def get_factor_from_speed(
     return factor
 
 
+class _BatchInitialize(Event):
+    # Same as ``simpy.events.Initialize``, but starts many processes at once
+    def __init__(self, env: Environment) -> None:
+        self.env = env
+        self.callbacks = []
+        self._value = None
+        self._ok = True
+        env.schedule(self, URGENT)
+
+
+class _BatchProcess(Process):
+    # Process started by a shared initialize event instead of its own
+    def __init__(self, env: Environment, generator, start: _BatchInitialize):
+        if not hasattr(generator, "throw"):
+            raise ValueError(f"{generator} is not a generator.")
+
+        self.env = env
+        self.callbacks = []
+        self._generator = generator
+        self._target = start
+        start.callbacks.append(self._resume)  # type: ignore
+
+
 class GSimulation(RealtimeEnvironment):
     """Extended ``simpy.rt.RealtimeEnvironment`` with graphical \
         capabilities of ``pygame`` to draw simulated objects.
@@ -76,8 +117,42 @@ class GSimulation(RealtimeEnvironment):
     :type debug_show: bool, optional
     :param debug_size: Debug stats size, defaults to 20
     :type debug_size: int, optional
+    :param debug_engine_stats: Show simulation engine statistics in debug \
+        stats, defaults to False
+    :type debug_engine_stats: bool, optional
+    :param headless: Draw to an offscreen surface instead of opening \
+        a ``pygame`` window, defaults to False
+    :type headless: bool, optional
+    :param realtime: Pace the simulation by wall-clock time, when disabled \
+        events are processed as fast as possible, defaults to ``not headless``
+    :type realtime: Optional[bool], optional
+    :param render_every: Render only every Nth frame, zero disables \
+        rendering completely, defaults to 1
+    :type render_every: int, optional
+    :param dirty_rendering: Repaint only screen areas of drawables marked \
+        as dirty, defaults to False
+    :type dirty_rendering: bool, optional
+    :param keyboard_control: Control the speed from the keyboard, defaults \
+        to True. Space pauses or resumes, right arrow steps a single frame \
+        while paused, up and down arrows switch to the next or previous \
+        ``GSimulationSpeed`` preset, keys 1 to 5 select presets from \
+        ``Real`` to ``Fastest`` and key 0 selects ``Max``.
+    :type keyboard_control: bool, optional
+    :param seed: Root seed of random streams, defaults to None (drawn from \
+        the global ``numpy.random`` state)
+    :type seed: Optional[int], optional
     """
 
+    # Speed presets switched by the keyboard, from the slowest
+    SpeedPresets = (
+        GSimulationSpeed.Real,
+        GSimulationSpeed.Slow,
+        GSimulationSpeed.Fast,
+        GSimulationSpeed.Faster,
+        GSimulationSpeed.Fastest,
+        GSimulationSpeed.Max,
+    )
+
     def __init__(
         self,
         fps=30,
@@ -87,6 +162,13 @@ class GSimulation(RealtimeEnvironment):
         simulation_strict=False,
         debug_show=False,
         debug_size=20,
+        debug_engine_stats=False,
+        headless=False,
+        realtime: Optional[bool] = None,
+        render_every=1,
+        dirty_rendering=False,
+        keyboard_control=True,
+        seed: Optional[int] = None,
     ) -> None:
         # Pygame
 
@@ -98,8 +180,23 @@ class GSimulation(RealtimeEnvironment):
         self._fps = fps
         self._resolution = resolution
         self._background_color = background_color
-        self._screen = pygame.display.set_mode(self._resolution)
-        self._draw_calls: List[Callable[[Surface, float], None]] = []
+        self._headless = headless
+        self._render_every = self._set_render_every(render_every)
+        self._screen = (
+            Surface(self._resolution)
+            if self._headless
+            else pygame.display.set_mode(self._resolution)
+        )
+        self._draw_calls = GDrawRegistry()
+        self._dirty_rendering = dirty_rendering
+        self._full_repaint = True
+        self._dirty_rects: List[pygame.Rect] = []
+        self._debug_rects: List[pygame.Rect] = []
+        self._recorder: Optional[GFrameRecorder] = None
+        self._profiler: Optional[GFrameProfiler] = None
+        self._statistics: Optional[GStateStatistics] = None
+        self._trace: Optional[GTraceWriter] = None
+        self._metrics: Optional[GMetricsServer] = None
 
         self._font = pygame.font.Font(None, debug_size)
 
@@ -107,37 +204,474 @@ class GSimulation(RealtimeEnvironment):
 
         # Simulation
 
+        self._realtime = (not headless) if realtime is None else realtime
+        self._keyboard_control = keyboard_control
+        self._streams = GRandomStreams(seed)
+        self._batch_start: Optional[_BatchInitialize] = None
+        self._factories: List["GFactoryObject"] = []
+        # Finished simulation objects waiting for reuse, keyed by class
+        self._pools: Dict[type, List["GSimulationObject"]] = {}
+        self._event_count = 0
+        self._frame_count = 0
+        self._process_count = 0
+        self._simulation_speed = simulation_speed
         factor = get_factor_from_speed(simulation_speed)
-        self._frame_ticks = 1 / (factor * self._fps)
+        self._frame_ticks = self._get_frame_ticks(factor, 1 / self._fps)
         super().__init__(factor=factor, strict=simulation_strict)
         self._exit_event = self.event()
+        self._frame_loop: Optional[Process] = None
+        # Triggered when fast forward ends, frame loop waits for it meanwhile
+        self._frames_resumed: Optional[Event] = None
+        self._quit = False
+        self._paused = False
+        self._step_until: Optional[float] = None
+        self._last_tick = time.time()
+
+        # Debug stats
+
+        self._stats_sample = (time.perf_counter(), self.now, 0, 0)
+        self._measured_fps = 0.0
+        self._events_per_second = 0.0
+        self._speed_ratio = 0.0
+
+        self._hud = GHud(size=debug_size)
+        self._hud.add_item("FPS", lambda: self._measured_fps, "{:.2f}")
+        self._hud.add_item("t", lambda: self.now, "{:.2f}")
+        self._hud.add_item("speed", self._describe_speed)
+        if debug_engine_stats:
+            self._hud.add_item("queue", lambda: self.queue_length)
+            self._hud.add_item("processes", lambda: self.process_count)
+            self._hud.add_item("events/s", lambda: self._events_per_second, "{:.0f}")
+            self._hud.add_item("sim/wall", lambda: self._speed_ratio, "{:.2f}")
+            self._hud.add_item("lag", lambda: self.lag, "{:.3f} s")
 
     @property
     def screen(self) -> Surface:
         return self._screen
 
-    def _event_loop(self):
-        if self._exit_event.triggered:
-            self._exit_event = self.event()
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        return self._resolution
 
-        run = True
+    @property
+    def headless(self) -> bool:
+        return self._headless
 
-        last_tick = time.time()
+    @property
+    def realtime(self) -> bool:
+        return self._realtime
 
-        # Start the draw loop
-        while run:
-            # Get delta time
-            current_tick = time.time()
-            dt = current_tick - last_tick
-            last_tick = current_tick
+    @property
+    def streams(self) -> GRandomStreams:
+        """Independent random streams of simulation components"""
+        return self._streams
+
+    @property
+    def render_every(self) -> int:
+        return self._render_every
+
+    @render_every.setter
+    def render_every(self, n: int):
+        self._render_every = self._set_render_every(n)
+
+    @property
+    def debug_show(self) -> bool:
+        return self._show_debug
+
+    @debug_show.setter
+    def debug_show(self, d: bool):
+        self._show_debug = d
+        self._full_repaint = True
+
+    @property
+    def hud(self) -> GHud:
+        """Debug stats HUD, custom lines can be added with ``add_item``"""
+        return self._hud
+
+    @property
+    def event_count(self) -> int:
+        """Count of processed simulation events"""
+        return self._event_count
+
+    @property
+    def frame_count(self) -> int:
+        """Count of rendered frames"""
+        return self._frame_count
+
+    @property
+    def measured_fps(self) -> float:
+        """Rendered frames per wall-clock second"""
+        return self._measured_fps
+
+    @property
+    def events_per_second(self) -> float:
+        """Processed simulation events per wall-clock second"""
+        return self._events_per_second
+
+    @property
+    def speed_ratio(self) -> float:
+        """Simulation time passed per wall-clock second"""
+        return self._speed_ratio
+
+    @property
+    def lag(self) -> float:
+        """Wall-clock seconds the simulation is behind real time"""
+        if not self._paced:
+            return 0.0
+        real_time = self.real_start + (self.now - self.env_start) * self.factor
+        return max(0.0, time.monotonic() - real_time)
+
+    @property
+    def queue_length(self) -> int:
+        """Count of scheduled simulation events"""
+        return len(self._queue)
+
+    @property
+    def process_count(self) -> int:
+        """Count of running simulation processes"""
+        return self._process_count
+
+    @property
+    def recorder(self) -> Optional[GFrameRecorder]:
+        """Frame recorder capturing every rendered frame"""
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, r: Optional[GFrameRecorder]):
+        if r is not None:
+            r.open(self._screen.get_size(), self._fps / max(self._render_every, 1))
+        self._recorder = r
+
+    @property
+    def profiler(self) -> Optional[GFrameProfiler]:
+        """Frame profiler measuring draw calls, events and simulation steps"""
+        return self._profiler
+
+    @profiler.setter
+    def profiler(self, p: Optional[GFrameProfiler]):
+        if p is not None:
+            p.budget = 1 / self._fps
+        self._profiler = p
+
+    @property
+    def statistics(self) -> Optional[GStateStatistics]:
+        """State occupancy collector observing simulation objects"""
+        return self._statistics
+
+    @statistics.setter
+    def statistics(self, s: Optional[GStateStatistics]):
+        if s is not None:
+            s.attach(lambda: self.now)
+        self._statistics = s
+
+    @property
+    def trace(self) -> Optional[GTraceWriter]:
+        """Trace writer recording state changes and container moves"""
+        return self._trace
+
+    @trace.setter
+    def trace(self, t: Optional[GTraceWriter]):
+        if t is not None:
+            t.open(lambda: self.now)
+        self._trace = t
+
+    @property
+    def metrics(self) -> Optional[GMetricsServer]:
+        """HTTP server of live simulation metrics"""
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, m: Optional[GMetricsServer]):
+        if self._metrics is not None and self._metrics is not m:
+            self._metrics.close()
+        if m is not None:
+            if self._statistics is None:
+                self.statistics = GStateStatistics(per_object=False)
+            m.open(self)
+        self._metrics = m
 
-            # Pygame event loop
+    @property
+    def dirty_rendering(self) -> bool:
+        return self._dirty_rendering
+
+    @dirty_rendering.setter
+    def dirty_rendering(self, d: bool):
+        self._dirty_rendering = d
+        self._full_repaint = True
+
+    @property
+    def simulation_speed(self) -> Union[GSimulationSpeed, int, float]:
+        return self._simulation_speed
+
+    @simulation_speed.setter
+    def simulation_speed(self, s: Union[GSimulationSpeed, int, float]):
+        factor = get_factor_from_speed(s)
+        self._simulation_speed = s
+        self._factor = factor
+        self._frame_ticks = self._get_frame_ticks(factor, self._frame_ticks)
+        self.sync()
+        self._wake_frame_loop()
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    @property
+    def _paced(self) -> bool:
+        # Unthrottled speed ignores the wall-clock even in real time mode
+        return self._realtime and self._factor > 0
+
+    def sync(self) -> None:
+        """Synchronizes the simulation clock with the wall-clock, the current \
+            simulation time starts at the current wall-clock time"""
+        self.env_start = self.now
+        self.real_start = time.monotonic()
+
+    def pause(self) -> None:
+        """Stops processing events, the window keeps being redrawn
+
+        :raises ValueError: When the simulation is headless.
+        """
+        if self._headless:
+            raise ValueError("Headless simulation cannot be paused")
+
+        self._paused = True
+        self._step_until = None
+
+    def resume(self) -> None:
+        """Continues paused simulation"""
+        self._paused = False
+        self._step_until = None
+
+    def step_frame(self) -> None:
+        """Processes events of a single frame while the simulation is paused"""
+        if self._paused:
+            self._step_until = self.now + self._frame_ticks
+
+    def step(self) -> None:
+        """Processes the next event, waiting for the wall-clock only when \
+            the simulation is paced in real time"""
+        if self._paused:
+            self._wait_paused()
+
+        if self._paced and self._step_until is None:
+            self._wait_realtime()
+
+        self._event_count += 1
+
+        # Unrendered simulation samples stats and answers metrics requests
+        # every 4096 events
+        if self._event_count % 4096 == 0:
+            self._sample_stats()
+            if self._metrics is not None:
+                self._metrics.poll()
+
+        if self._profiler is None:
+            return Environment.step(self)
+
+        start = time.perf_counter()
+        try:
+            Environment.step(self)
+        finally:
+            self._profiler.add_phase("simulation", time.perf_counter() - start)
+
+    def process(self, generator) -> Process:
+        """Creates new simulation process, see ``simpy.Environment.process``"""
+        if self._batch_start is None:
+            p = super().process(generator)
+        else:
+            p = _BatchProcess(self, generator, self._batch_start)
+        self._process_count += 1
+        p.callbacks.append(self._process_finished)  # type: ignore
+        return p
+
+    @contextmanager
+    def batch_processes(self) -> Iterator[None]:
+        """Processes created inside of the context are started together \
+            by a single event, instead of one event per process
+
+        >>> def idle(env):
+        ...     yield env.timeout(1)
+        >>> env = GSimulation(headless=True)
+        >>> with env.batch_processes():
+        ...     processes = [env.process(idle(env)) for _ in range(3)]
+        >>> env.queue_length
+        1
+        """
+        if self._batch_start is not None:
+            yield
+            return
+
+        self._batch_start = _BatchInitialize(self)
+        try:
+            yield
+        finally:
+            self._batch_start = None
+
+    def _process_finished(self, event: Event) -> None:
+        self._process_count -= 1
+
+    def _sample_stats(self) -> None:
+        # Rates over at least one HUD refresh interval, whether shown or not
+        wall, now, events, frames = self._stats_sample
+        sample = (time.perf_counter(), self.now, self._event_count, self._frame_count)
+        elapsed = sample[0] - wall
+
+        if elapsed <= 0 or elapsed < self._hud.refresh_interval:
+            return
+
+        self._measured_fps = (sample[3] - frames) / elapsed
+        self._events_per_second = (sample[2] - events) / elapsed
+        self._speed_ratio = (sample[1] - now) / elapsed
+        self._stats_sample = sample
+
+    def _wait_realtime(self) -> None:
+        # Same pacing as ``RealtimeEnvironment.step``, kept apart from
+        # event processing so the simulation step can be measured on its own
+        evt_time = self.peek()
+
+        if evt_time is Infinity:
+            raise EmptySchedule()
+
+        real_time = self.real_start + (evt_time - self.env_start) * self.factor
+
+        if self.strict and time.monotonic() - real_time > self.factor:
+            delta = time.monotonic() - real_time
+            raise RuntimeError(f"Simulation too slow for real time ({delta:.3f}s).")
+
+        while True:
+            delta = real_time - time.monotonic()
+            if delta <= 0:
+                break
+            time.sleep(delta)
+
+    def _wait_paused(self) -> None:
+        # Keeps the window responsive until resumed or a single frame is stepped
+        while self._paused and not self._quit:
+            if self._step_until is not None:
+                if self.peek() <= self._step_until:
+                    return
+                self._step_until = None
+
+            start = time.perf_counter()
+            self._update_frame(render=True, record=False)
+            time.sleep(max(0.0, 1 / self._fps - (time.perf_counter() - start)))
+
+        self._paused = False
+        self._step_until = None
+        self.sync()
+
+    def _stepping_frame(self) -> bool:
+        # Paused simulation processes events of a stepped frame
+        if self._step_until is not None and self.peek() <= self._step_until:
+            return True
+        self._step_until = None
+        return False
+
+    async def _wait_paused_async(self) -> None:
+        start = time.perf_counter()
+        self._update_frame(render=True, record=False)
+        await asyncio.sleep(max(0.0, 1 / self._fps - (time.perf_counter() - start)))
+
+        if self._quit:
+            self._paused = False
+        if not self._paused:
+            self._step_until = None
+            self.sync()
+
+    def _get_realtime_delay(self) -> float:
+        # Wall-clock seconds until the next event is due
+        evt_time = self.peek()
+        if evt_time is Infinity:
+            return 0.0
+        real_time = self.real_start + (evt_time - self.env_start) * self.factor
+        return real_time - time.monotonic()
+
+    def _handle_event(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.QUIT:
+            self._quit = True
+            return
+
+        if not self._keyboard_control or event.type != pygame.KEYDOWN:
+            return
+
+        presets = self.SpeedPresets
+        if event.key == pygame.K_SPACE and self._paused:
+            self.resume()
+        elif event.key == pygame.K_SPACE:
+            self.pause()
+        elif event.key == pygame.K_RIGHT:
+            self.step_frame()
+        elif event.key == pygame.K_UP:
+            faster = [p for p in presets if get_factor_from_speed(p) < self._factor]
+            if faster:
+                self.simulation_speed = faster[0]
+        elif event.key == pygame.K_DOWN:
+            slower = [p for p in presets if get_factor_from_speed(p) > self._factor]
+            if slower:
+                self.simulation_speed = slower[-1]
+        elif pygame.K_1 <= event.key <= pygame.K_5:
+            self.simulation_speed = presets[event.key - pygame.K_1]
+        elif event.key == pygame.K_0:
+            self.simulation_speed = GSimulationSpeed.Max
+
+    def _update_frame(self, render: bool, record: bool = True) -> None:
+        profiler = self._profiler
+
+        if render and profiler is not None:
+            profiler.begin_frame()
+
+        self._sample_stats()
+
+        if self._metrics is not None:
+            self._metrics.poll()
+
+        # Pygame event loop
+        if not self._headless:
+            start = time.perf_counter()
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    run = False
+                self._handle_event(event)
+            if profiler is not None:
+                profiler.add_phase("events", time.perf_counter() - start)
+
+        if not render:
+            return
+
+        # Get delta time
+        current_tick = time.time()
+        dt = current_tick - self._last_tick
+        self._last_tick = current_tick
 
-            # Process draw calls
-            self._process_draw_calls(dt)
+        self._process_draw_calls(dt)
+        self._frame_count += 1
+
+        if record and self._recorder is not None:
+            self._recorder.capture(self._screen)
+
+        if profiler is not None:
+            profiler.end_frame()
+
+    def _event_loop(self):
+        frame = 0
+
+        self._quit = False
+        self._last_tick = time.time()
+
+        # Start the draw loop
+        while not self._quit:
+            if self._frames_resumed is not None:
+                yield self._frames_resumed
+                continue
+
+            render = bool(self._render_every) and frame % self._render_every == 0
+
+            # Unthrottled window is redrawn at the fps of the wall-clock
+            if render and not self._headless and not self._paced:
+                render = time.time() - self._last_tick >= 1 / self._fps
+
+            self._update_frame(render)
+
+            frame += 1
 
             # sleep_time = self._frame_ticks - dt
 
@@ -147,67 +681,385 @@ class GSimulation(RealtimeEnvironment):
             # else:
             #     yield self.timeout(self._frame_ticks)
 
-            yield self.timeout(self._frame_ticks)
+            try:
+                yield self.timeout(self._frame_ticks)
+            except Interrupt:
+                # Speed changed, the next frame is timed by the new speed
+                pass
 
         # End the simulation
         self._exit_event.succeed()
 
     def _process_draw_calls(self, delta: float):
+        if self._dirty_rendering:
+            self._process_dirty_draw_calls(delta)
+            return
+
         # Repaint the screen
         self._screen.fill(self._background_color)
         # Repaint each draw call
         for draw_call in self._draw_calls:
-            draw_call(self._screen, delta)
+            self._draw(draw_call, delta)
         # Draw debug
-        self._draw_debug(self._screen, delta)
+        self._update_debug()
+        self._draw_debug(self._screen)
         # Refresh screen
-        pygame.display.flip()
+        self._present()
+
+    def _process_dirty_draw_calls(self, delta: float):
+        screen = self._screen
+        full = self._full_repaint
+        debug_changed = self._update_debug()
+        rects = self._dirty_rects + (self._debug_rects if debug_changed else [])
+        bounds: Dict[int, Optional[pygame.Rect]] = {}
+        self._dirty_rects = []
+
+        # Collect areas of changed drawables, before and after the change
+        for draw_call in self._draw_calls:
+            if not isinstance(draw_call, GDrawable):
+                # Plain callables can draw anywhere
+                full = True
+                break
+            if not draw_call.dirty:
+                bounds[id(draw_call)] = draw_call._drawn_rect
+                continue
+            rect = draw_call.bounds(screen)
+            if rect is None:
+                full = True
+                break
+            if draw_call._drawn_rect is not None:
+                rects.append(draw_call._drawn_rect)
+            rects.append(rect)
+            bounds[id(draw_call)] = rect
+
+        if full:
+            screen.fill(self._background_color)
+            for draw_call in self._draw_calls:
+                self._draw(draw_call, delta)
+            self._debug_rects = self._draw_debug(screen)
+            self._present()
+            self._full_repaint = False
+        else:
+            screen_rect = screen.get_rect()
+            regions = merge_rects(
+                [r.clip(screen_rect) for r in rects if r.colliderect(screen_rect)]
+            )
+            # Repaint background and every drawable overlapping changed regions
+            for region in regions:
+                screen.set_clip(region)
+                screen.fill(self._background_color)
+                for draw_call in self._draw_calls:
+                    rect = bounds[id(draw_call)]
+                    if rect is None or rect.colliderect(region):
+                        self._draw(draw_call, delta)
+            screen.set_clip(None)
+            if debug_changed:
+                # Area of the previous debug text was repainted above
+                self._debug_rects = self._draw_debug(screen)
+            else:
+                # Antialiased text blitted over itself thickens, unchanged
+                # debug text is drawn only where the background was repainted
+                for region in regions:
+                    screen.set_clip(region)
+                    self._draw_debug(screen)
+                screen.set_clip(None)
+            self._present(regions + (self._debug_rects if debug_changed else []))
 
-    def _draw_debug(self, screen: Surface, dt: float):
-        if not self._show_debug:
+        for draw_call in self._draw_calls:
+            if isinstance(draw_call, GDrawable) and draw_call.dirty:
+                draw_call._mark_drawn(
+                    bounds[id(draw_call)]
+                    if id(draw_call) in bounds
+                    else draw_call.bounds(screen)
+                )
+
+    def _draw(self, draw_call: Callable[[Surface, float], None], delta: float):
+        if self._profiler is None:
+            draw_call(self._screen, delta)
             return
 
-        if dt == 0.0:
+        start = time.perf_counter()
+        draw_call(self._screen, delta)
+        self._profiler.add_draw(draw_call, time.perf_counter() - start)
+
+    def _present(self, rects: Optional[List[pygame.Rect]] = None):
+        if self._headless:
             return
 
-        text_fps_surface = self._font.render(
-            f"FPS = {round(1/dt, 2)}", True, (255, 255, 255)
-        )
-        text_t_surface = self._font.render(
-            f"t = {round(self.now, 2)}", True, (255, 255, 255)
-        )
-        text_t_rect = text_t_surface.get_rect()
+        start = time.perf_counter()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+        if self._profiler is not None:
+            self._profiler.add_phase("present", time.perf_counter() - start)
+
+    def _update_debug(self) -> bool:
+        # Returns if debug stats have to be repainted
+        changed = self._show_debug and self._hud.update()
+        overlay = self._profiler is not None and self._profiler.show_overlay
+        return changed or overlay
+
+    def _draw_debug(self, screen: Surface) -> List[pygame.Rect]:
+        rects: List[pygame.Rect] = []
+
+        if self._profiler is not None and self._profiler.show_overlay:
+            rects += self._profiler.draw_overlay(screen, self._font)
 
-        screen.blit(text_fps_surface, (5, 5))
-        screen.blit(text_t_surface, (5, 10 + text_t_rect.height))
+        if self._show_debug:
+            rects += self._hud.draw(screen)
 
-    def add_drawable(self, callable: GDrawable):
+        return rects
+
+    def add_drawable(
+        self,
+        callable: Callable[[Surface, float], None],
+        layer: Union[GLayer, int] = GLayer.Objects,
+    ) -> GDrawHandle:
         """Adds drawable object to draw call pool
 
         :param callable: Callable GDrawable object
         :type callable: GDrawable
+        :param layer: Layer to draw the object in, defaults to GLayer.Objects
+        :type layer: Union[GLayer, int], optional
+        :return: Handle for constant time removal
+        :rtype: GDrawHandle
         """
-        self._draw_calls.append(callable)
+        handle = self._draw_calls.add(callable, layer)
+        if isinstance(callable, GDrawable):
+            callable.mark_dirty()
+        return handle
 
-    def remove_drawable(self, callable: GDrawable):
+    def add_drawables(
+        self,
+        callables: Iterable[Callable[[Surface, float], None]],
+        layer: Union[GLayer, int] = GLayer.Objects,
+    ) -> List[GDrawHandle]:
+        """Adds many drawable objects to draw call pool at once
+
+        :param callables: Callable GDrawable objects
+        :type callables: Iterable[GDrawable]
+        :param layer: Layer to draw the objects in, defaults to GLayer.Objects
+        :type layer: Union[GLayer, int], optional
+        :return: Handles in order of the objects
+        :rtype: List[GDrawHandle]
+        """
+        return [self.add_drawable(c, layer) for c in callables]
+
+    def remove_drawable(
+        self, callable: Union[GDrawHandle, Callable[[Surface, float], None]]
+    ):
         """Removes drawable object from draw call pool
 
-        :param callable: Callable GDrawable object
-        :type callable: GDrawable
+        :param callable: Draw call handle or callable GDrawable object
+        :type callable: Union[GDrawHandle, GDrawable]
+        """
+        draw_call = self._draw_calls.remove(callable)
+
+        if draw_call is None:
+            return
+
+        # Area of removed drawable has to be repainted
+        if not self._dirty_rendering:
+            return
+        if isinstance(draw_call, GDrawable) and draw_call._drawn_rect is not None:
+            self._dirty_rects.append(draw_call._drawn_rect)
+        else:
+            self._full_repaint = True
+
+    def enable_layer(self, layer: Union[GLayer, int]):
+        """Draws the layer again
+
+        :param layer: Target layer
+        :type layer: Union[GLayer, int]
+        """
+        self._draw_calls.enable_layer(layer)
+        self._full_repaint = True
+
+    def disable_layer(self, layer: Union[GLayer, int]):
+        """Stops drawing the layer without removing its draw calls
+
+        :param layer: Target layer
+        :type layer: Union[GLayer, int]
+        """
+        self._draw_calls.disable_layer(layer)
+        self._full_repaint = True
+
+    def run(
+        self,
+        until: Optional[Union[float, Event]] = None,
+        fast_forward_until: Optional[float] = None,
+    ):
+        """Starts the simulation
+
+        :param until: Simulation time or event at which the simulation stops, \
+            required when running headless, defaults to None (until the window \
+            is closed)
+        :type until: Optional[Union[float, Event]], optional
+        :param fast_forward_until: Simulation time up to which events are \
+            processed without rendering and wall-clock pacing, defaults to None
+        :type fast_forward_until: Optional[float], optional
+        :raises ValueError: When headless simulation is run without ``until``.
+        :raises ValueError: When fast forward time is not between the current \
+            time and ``until``.
+        """
+        if self._exit_event.triggered:
+            self._exit_event = self.event()
+
+        stop = self._set_until(until)
+
+        if fast_forward_until is not None:
+            fast_forward_until = self._set_fast_forward_until(fast_forward_until, until)
+            self._fast_forward(fast_forward_until, stop)
+            if stop.processed:
+                return super().run(until=stop)
+
+        self._start_frame_loop()
+
+        return super().run(until=stop)
+
+    async def run_async(self, until: Optional[Union[float, Event]] = None) -> Any:
+        """Executes simulation in an ``asyncio`` event loop, which keeps \
+            running other tasks while the simulation waits for the wall-clock \
+            or is paused. Unpaced simulation yields to the loop whenever \
+            simulation time of a frame passed.
+
+        >>> import asyncio
+        >>> env = GSimulation(headless=True, render_every=0)
+        >>> asyncio.run(env.run_async(until=10))
+        >>> env.now
+        10
+
+        :param until: Simulation time or event at which the simulation stops, \
+            required when running headless, defaults to None (until the window \
+            is closed)
+        :type until: Optional[Union[float, Event]], optional
+        :raises ValueError: When headless simulation is run without ``until``.
+        :return: Value of the until event
+        :rtype: Any
         """
-        targetId = -1
-        for index, item in enumerate(self._draw_calls):
-            if id(item) == id(callable):
-                targetId = index
+        if self._exit_event.triggered:
+            self._exit_event = self.event()
+
+        stop = self._set_until(until)
+
+        self._start_frame_loop()
+
+        next_yield, events = self.now, self._event_count
+        while not stop.processed:
+            if self._paused and not self._stepping_frame():
+                await self._wait_paused_async()
+                continue
+
+            if self._paced and self._step_until is None:
+                delay = self._get_realtime_delay()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+            try:
+                self.step()
+            except EmptySchedule:
                 break
 
-        if targetId != -1:
-            self._draw_calls.pop(targetId)
+            # Many events at the same time yield as well
+            if self.now >= next_yield or self._event_count - events >= 4096:
+                next_yield, events = self.now + self._frame_ticks, self._event_count
+                await asyncio.sleep(0)
+
+        return stop.value if stop.processed else None
+
+    def _start_frame_loop(self) -> None:
+        # Frame loop of a previous run keeps running, only one is started
+        if self._headless and self._render_every == 0:
+            return
+        if self._frame_loop is None or not self._frame_loop.is_alive:
+            self._frame_loop = self.process(self._event_loop())
+
+    def _wake_frame_loop(self) -> None:
+        # Frame scheduled at the previous speed could be far ahead, waking
+        # the loop from inside of itself is not needed
+        loop = self._frame_loop
+        if (
+            loop is not None
+            and loop.is_alive
+            and loop is not self.active_process
+            and isinstance(loop.target, Timeout)
+        ):
+            loop.interrupt()
+
+    def _fast_forward(self, until: float, stop: Event) -> None:
+        realtime, profiler = self._realtime, self._profiler
+        self._realtime, self._profiler = False, None
+        target = self.timeout(until - self.now)
+        # Frame loop of a previous run is suspended, not only throttled
+        self._frames_resumed = self.event()
+
+        try:
+            while not (target.processed or stop.processed):
+                self.step()
+                # Keeps the window responsive without rendering
+                if not self._headless and self._event_count % 4096 == 0:
+                    if pygame.event.get(pygame.QUIT):
+                        self._exit_event.succeed()
+        finally:
+            self._realtime, self._profiler = realtime, profiler
+            resumed, self._frames_resumed = self._frames_resumed, None
+            resumed.succeed()
+
+        self._full_repaint = True
+        self.sync()
+
+    # Helpers
+
+    def _describe_speed(self) -> str:
+        if self._paused:
+            return "paused"
+        if self._factor == 0:
+            return "max"
+        return f"x{1 / self._factor:g}"
+
+    def _get_frame_ticks(self, factor: float, default: float) -> float:
+        # Simulation time between frames, unthrottled speed keeps the previous
+        if factor == 0:
+            return default
+        return 1 / (factor * self._fps)
+
+    def _set_render_every(self, n: int) -> int:
+        if not isinstance(n, int):
+            raise ValueError("Invalid type for render_every supplied")
+
+        if n < 0:
+            raise ValueError("Negative render_every supplied")
+
+        return n
+
+    def _set_until(self, until: Optional[Union[float, Event]]) -> Event:
+        if until is None:
+            if self._headless:
+                raise ValueError("Headless simulation has to be run with until")
+            return self._exit_event
 
-    def run(self):
-        """Starts the simulation"""
-        self.process(self._event_loop())
-        return super().run(until=self._exit_event)
+        if not isinstance(until, Event):
+            if until <= self.now:
+                raise ValueError("Until has to be bigger than current time")
+            until = self.timeout(until - self.now)
+
+        if self._headless:
+            return until
+
+        return self.any_of([self._exit_event, until])
+
+    def _set_fast_forward_until(
+        self, t: float, until: Optional[Union[float, Event]]
+    ) -> float:
+        if t <= self.now:
+            raise ValueError("Fast forward time has to be bigger than current time")
+
+        if until is not None and not isinstance(until, Event) and t >= until:
+            raise ValueError("Fast forward time has to be smaller than until")
+
+        return t
 
 
 class GSimulationObject(GDrawable):
@@ -224,6 +1076,13 @@ class GSimulationObject(GDrawable):
         inherited class as follows: 'Shape = SomeShapeObject', this \
         will set the default param shape for all instances
 
+    :func:`~pysg.core.GSimulationObject.PoolSize` can be overriden in \
+        inherited class as follows: 'PoolSize = 1000', instances are then \
+        reused by the same simulation after their life cycle ends, when \
+        they are not held by any container or registered as drawable. \
+        Finished instances must not be referenced by the model, they are \
+        initialized again on reuse, keeping their shape object.
+
     :param env: Graphical envirioment.
     :type env: :class:`~pysg.environment.GEnvironment`
     :param states: User defined state to color mapper created \
@@ -240,8 +1099,18 @@ class GSimulationObject(GDrawable):
     :type auto_run: bool, optional
     """
 
+    __slots__ = ("_id", "_env", "_states", "_current_state", "_process")
+
     _object_id_counter = count(0)
 
+    def __new__(cls, *args, **kwargs):
+        # Simulation is the first argument of every simulation object
+        env = args[0] if args else kwargs.get("env")
+        pool = env._pools.get(cls) if isinstance(env, GSimulation) else None
+        if pool:
+            return pool.pop()
+        return super().__new__(cls)
+
     def __init__(
         self,
         env: GSimulation,
@@ -249,12 +1118,16 @@ class GSimulationObject(GDrawable):
         default_state: Optional[GStateColorMapper] = None,
         shape: Optional[GShape] = None,
     ) -> None:
+        reused = getattr(self, "_env", None) is not None
         self._id = next(self._object_id_counter)
         self._env = env
         self._states = self._set_states(states)
         self._current_state = self._set_current_state(default_state)
 
-        super().__init__(shape)
+        if reused:
+            self._reuse(shape)
+        else:
+            super().__init__(shape)
 
         self.run()
 
@@ -264,6 +1137,16 @@ class GSimulationObject(GDrawable):
     def id(self) -> int:
         return self._id
 
+    @property
+    def finished(self) -> bool:
+        """If the life cycle of the object ended"""
+        return not self._process.is_alive
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Random generator shared by all objects of the class"""
+        return self._env.streams.generator(type(self))
+
     @property
     def states(self) -> GStateColorMapperMeta:
         return self._states
@@ -274,11 +1157,20 @@ class GSimulationObject(GDrawable):
 
     @current_state.setter
     def current_state(self, s: Optional[GStateColorMapper]) -> None:
+        if s is self._current_state:
+            return
         c = self._set_current_state(s)
-        if c == self._current_state:
+        if c is self._current_state:
             return
-        self._shape.color = c._get_color
+        if self._env._statistics is not None:
+            self._env._statistics.change(self, c)
+        if self._env._trace is not None:
+            self._env._trace.state_changed(self, c)
+        for owner in self._owners.values():
+            owner._state_changed(self, self._current_state, c)
+        self._shape.color = c._state_color  # type: ignore
         self._current_state = c
+        self.mark_dirty()
 
     # Overridable
 
@@ -290,6 +1182,12 @@ class GSimulationObject(GDrawable):
         # States = TestState  # type: ignore
         return None
 
+    @property
+    def PoolSize(self) -> Optional[int]:
+        """Count of finished instances kept for reuse. **CAN be overidden, \
+            instances are not reused by default**"""
+        return None
+
     @abstractmethod
     def life_cycle(self):
         """Simulation life cycle. **HAS to be overidden!**"""
@@ -299,7 +1197,65 @@ class GSimulationObject(GDrawable):
 
     def run(self) -> None:
         """Starts objects simulation"""
-        self._env.process(self.life_cycle())
+        process = self._env.process(self.life_cycle())
+        self._process = process
+        if self._env._statistics is not None:
+            self._env._statistics.observe(self)
+            process.callbacks.append(self._close_statistics)  # type: ignore
+        if self._env._trace is not None:
+            self._env._trace.created(self)
+            process.callbacks.append(self._finish_trace)  # type: ignore
+        if self.PoolSize:
+            process.callbacks.append(self._release)  # type: ignore
+
+    @classmethod
+    def pooled(cls, env: GSimulation) -> int:
+        """Count of finished instances of the class waiting for reuse
+
+        :param env: Simulation reusing the instances
+        :type env: GSimulation
+        :rtype: int
+        """
+        return len(env._pools.get(cls, ()))
+
+    @classmethod
+    def clear_pool(cls, env: GSimulation) -> None:
+        """Drops finished instances of the class waiting for reuse
+
+        :param env: Simulation reusing the instances
+        :type env: GSimulation
+        """
+        env._pools.pop(cls, None)
+
+    def _close_statistics(self, event: Event) -> None:
+        if self._env._statistics is not None:
+            self._env._statistics.close(self)
+
+    def _finish_trace(self, event: Event) -> None:
+        if self._env._trace is not None:
+            self._env._trace.finished(self)
+
+    def _entered(self, container: GDrawable) -> None:
+        if self._env._metrics is not None:
+            self._env._metrics.watch_container(container)
+        if self._env._trace is not None:
+            self._env._trace.entered(self, container)
+
+    def _left(self, container: GDrawable) -> None:
+        if self._env._trace is not None:
+            self._env._trace.left(self, container)
+
+    def _get_state(self) -> GStateColorMapper:
+        return self._current_state
+
+    def _release(self, event: Event) -> None:
+        # Failed, contained or still drawn objects are not reused
+        if not event.ok or self._owners or self in self._env._draw_calls:
+            return
+
+        pool = self._env._pools.setdefault(type(self), [])
+        if len(pool) < self.PoolSize:  # type: ignore
+            pool.append(self)
 
     # Helpers
 
@@ -321,16 +1277,30 @@ class GSimulationObject(GDrawable):
         self, state: Optional[GStateColorMapper]
     ) -> GStateColorMapper:
         if state is None:
-            return list(self._states._value2member_map_.values())[0]  # type: ignore
+            return self._states._state_table[0]  # type: ignore
         elif isinstance(state, GStateColorMapper):
-            vals = [v.name for v in self._states._value2member_map_.values()]
-            if state.name not in vals:
+            if state.name not in self._states._state_names:  # type: ignore
                 raise ValueError("Invalid state value supplied")
             return state
         else:
             raise ValueError("Invalid state type supplied")
 
 
+def accepts_size(distribution: Callable[..., Any]) -> bool:
+    """Checks if the distribution function draws arrays with ``size`` argument
+
+    :param distribution: Distribution function
+    :type distribution: Callable[..., Any]
+    :rtype: bool
+    """
+    try:
+        parameters = inspect.signature(distribution).parameters.values()
+    except (TypeError, ValueError):
+        return False
+
+    return any(p.name == "size" or p.kind == p.VAR_KEYWORD for p in parameters)
+
+
 class FactoryType(Enum):
     Infinite = 0
     Finite = 1
@@ -344,10 +1314,20 @@ class GFactoryObject(GDrawable):
     :param shape: Default shape, defaults to None
     :type shape: Optional[GShape], optional
     :param distribution: Default distribution function, defaults to \
-        :func:`~numpy.random.exponential`
-    :type distribution: Optional[Callable[[Any], float]], optional
+        exponential distribution of the factory generator. Distributions \
+        accepting ``size`` argument are sampled in batches.
+    :type distribution: Optional[Callable[..., Union[float, np.ndarray]]], optional
     :param occurance: How often should build function be called, defaults to 1.0
     :type occurance: Optional[float], optional
+    :param batch_size: Count of inter-arrival times drawn at once, defaults \
+        to 1024
+    :type batch_size: int, optional
+    :param rng: Factory random generator, defaults to None (new stream \
+        of the simulation)
+    :type rng: Optional[np.random.Generator], optional
+    :param build_batch: Count of objects a finite factory builds in one \
+        step with :func:`build_many`, defaults to 1
+    :type build_batch: int, optional
     """
 
     _object_id_counter = count(0)
@@ -358,16 +1338,23 @@ class GFactoryObject(GDrawable):
         shape: Optional[GShape] = None,
         factory_type: FactoryType = FactoryType.Infinite,
         factory_max_build=5,
-        distribution: Optional[Callable[[Any], float]] = None,
+        distribution: Optional[Callable[..., Union[float, np.ndarray]]] = None,
         occurance: Optional[float] = None,
+        batch_size: int = 1024,
+        rng: Optional[np.random.Generator] = None,
+        build_batch: int = 1,
     ) -> None:
         self._id = next(self._object_id_counter)
         self._env = env
+        self._rng = self._set_rng(rng)
         self._type = self._set_type(factory_type)
         self._max_build = self._set_build_count(factory_max_build)
         self._distribution = self._set_time(distribution)
         self._occurance = self._set_occurance(occurance)
+        self._batch_size = self._set_batch_size(batch_size)
+        self._build_batch = self._set_build_batch(build_batch)
         self._build_count = 0
+        env._factories.append(self)
 
         super().__init__(shape)
 
@@ -383,6 +1370,14 @@ class GFactoryObject(GDrawable):
     def build_count(self) -> int:
         return self._build_count
 
+    @property
+    def rng(self) -> np.random.Generator:
+        return self._rng
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
     # Overridable
 
     @property
@@ -402,7 +1397,7 @@ class GFactoryObject(GDrawable):
         pass
 
     @property
-    def Distribution(self) -> Optional[Callable[[Any], float]]:
+    def Distribution(self) -> Optional[Callable[..., Union[float, np.ndarray]]]:
         """Target to spawn. **CAN to be overidden, will use exponential \
             distribution by default**
         """
@@ -419,16 +1414,29 @@ class GFactoryObject(GDrawable):
         # States = TestState  # type: ignore
         pass
 
+    def _intervals(self) -> Iterator[float]:
+        if self._batch_size == 1 or not accepts_size(self._distribution):
+            while True:
+                yield self._distribution(self._occurance)
+
+        while True:
+            batch = self._distribution(self._occurance, size=self._batch_size)
+            yield from np.asarray(batch, np.float64).tolist()
+
     def _life_cycle(self):
         if self._type == FactoryType.Infinite:
+            intervals = self._intervals()
             while True:
                 self.build()
                 self._build_count += 1
-                yield self._env.timeout(self._distribution(self._occurance))
+                yield self._env.timeout(next(intervals))
         else:
-            for i in range(self._max_build):
-                self.build()
-                self._build_count += 1
+            remaining = self._max_build
+            while remaining > 0:
+                batch = min(self._build_batch, remaining)
+                self.build_many(batch)
+                self._build_count += batch
+                remaining -= batch
                 yield self._env.timeout(0)
 
     # Simulation
@@ -445,6 +1453,17 @@ class GFactoryObject(GDrawable):
         """
         pass
 
+    def build_many(self, count: int) -> None:
+        """Builds objects at once, their processes are started by a single \
+            event. **CAN be overridden** to create the objects in bulk.
+
+        :param count: Count of built objects
+        :type count: int
+        """
+        with self._env.batch_processes():
+            for _ in range(count):
+                self.build()
+
     # Helpers
 
     def _set_build_count(self, c: Optional[int]) -> int:
@@ -461,13 +1480,34 @@ class GFactoryObject(GDrawable):
             return t
         return self.Type
 
-    def _set_time(self, c: Optional[Callable[[Any], float]]) -> Callable[[Any], float]:
+    def _set_time(
+        self, c: Optional[Callable[..., Union[float, np.ndarray]]]
+    ) -> Callable[..., Union[float, np.ndarray]]:
         if self.Distribution is None:
             if c is None:
-                return exponential
+                return self._rng.exponential
             return c
         return self.Distribution
 
+    def _set_batch_size(self, b: int) -> int:
+        if b <= 0:
+            raise ValueError("Zero or negative batch size supplied")
+
+        return b
+
+    def _set_build_batch(self, b: int) -> int:
+        if b <= 0:
+            raise ValueError("Zero or negative build batch supplied")
+
+        return b
+
+    def _set_rng(self, r: Optional[np.random.Generator]) -> np.random.Generator:
+        if r is None:
+            return self._env.streams.spawn()
+        if not isinstance(r, np.random.Generator):
+            raise ValueError("Invalid random generator type supplied")
+        return r
+
     def _set_occurance(self, o: Optional[float]) -> float:
         if self.Occurance is None:
             if o is None:
@@ -11,6 +11,10 @@ from .container import (
     GOverflow,
 )
 from .text import GText
+from .label import GLabelCache
+from .stamp import GStampCache
+from .registry import GDrawRegistry, GDrawHandle, GLayer
+from .entities import GEntityStore
 
 __all__ = [
     "GStateColorMapper",
@@ -27,4 +31,10 @@ __all__ = [
     "GFillDirection",
     "GOverflow",
     "GText",
+    "GLabelCache",
+    "GStampCache",
+    "GDrawRegistry",
+    "GDrawHandle",
+    "GLayer",
+    "GEntityStore",
 ]
@@ -71,7 +71,11 @@ def color_enumerations_to_colors(
 
 
 class GStateColorMapperMeta(EnumMeta):
-    """Meta class for :class:`~.GStateColorMapper`"""
+    """Meta class for :class:`~.GStateColorMapper`
+
+    Compiles dense state tables at class creation, every state knows its \
+        index and color, so lookups during the simulation are constant time.
+    """
 
     def __new__(cls, cls_str: str, bases, classdict, **kwds):
         enumerations = {x: y for x, y in classdict.items() if not x.startswith("_")}
@@ -79,6 +83,16 @@ class GStateColorMapperMeta(EnumMeta):
         enum = super().__new__(cls, cls_str, bases, classdict, **kwds)
         enum._enumerations = enumerations  # type: ignore
         enum._colors = color_enumerations_to_colors(enumerations)  # type: ignore
+
+        # States and colors indexed by state index, in definition order
+        members = [enum._member_map_[name] for name in enum._member_names_]
+        enum._state_table = tuple(members)  # type: ignore
+        enum._color_table = tuple(enum._colors[m.name] for m in members)  # type: ignore
+        enum._state_names = {m.name: m for m in members}  # type: ignore
+        for index, member in enumerate(members):
+            member._state_index = index
+            member._state_color = enum._colors[member.name]  # type: ignore
+
         return enum
 
     def __getitem__(cls, key):
@@ -107,15 +121,20 @@ class GStateColorMapper(Enum, metaclass=GStateColorMapperMeta):
     """
 
     def __get__(self, instance, owner):
-        return self.__class__.__members__[self.name]
+        return self
 
     @property
     def _get_value(self) -> Union[str, int]:
-        return self.__class__.__members__[self.name].value
+        return self.value
 
     @property
     def _get_color(self) -> pygame.Color:
-        return self.__class__._colors[self.name]  # type: ignore
+        return self._state_color  # type: ignore
+
+    @property
+    def _get_index(self) -> int:
+        """Index of the state in the state table"""
+        return self._state_index  # type: ignore
 
 
 class DefaultColors(GStateColorMapper):
@@ -1,7 +1,8 @@
-from typing import Dict, Tuple, Optional, List
+from typing import Dict, Hashable, Tuple, Optional, List, Set
 from itertools import count
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 from enum import Enum
+import heapq
 import math
 
 import pygame
@@ -9,7 +10,9 @@ from pygame.surface import Surface
 
 from .drawable import GDrawable
 from .color import DefaultColors
+from .label import get_label_cache
 from .shape import GShape, GShapeType
+from .stamp import get_stamp_cache
 from ..util import array_chunks
 
 
@@ -89,7 +92,7 @@ class GOverflow(Enum):
     # Clip = 2
 
 
-class GContainerBase(ABC):
+class GContainerBase(GDrawable):
     """Base class for Containers
 
     :param size: Container size
@@ -111,6 +114,9 @@ class GContainerBase(ABC):
     :type spacing: int, optional
     :param reverse: Container item order, defaults to False
     :type reverse: bool, optional
+    :param labels: Draw ids of items, turned off for big populations, \
+        defaults to True
+    :type labels: bool, optional
     """
 
     _object_id_counter = count(0)
@@ -126,19 +132,36 @@ class GContainerBase(ABC):
         padding: int = 5,
         spacing: int = 5,
         reverse: bool = False,
+        labels: bool = True,
     ) -> None:
         self._id = next(self._object_id_counter)
-        self._objects: Dict[str, GDrawable] = {}
+        # Keyed by object id
+        self._objects: Dict[int, GDrawable] = {}
         self._size = size
         self._position = position
-        self._shape = self._set_shape(shape)
+        super().__init__(shape)
         self._align = align
         self._fill_direction = fill_direction
         self._overflow = overflow
         self._padding = padding
         self._spacing = spacing
-        self._max_object_size = 0
         self._reverse = reverse
+        # Member aggregates, updated on every enter and leave
+        self._max_object_size = 0
+        self._total_object_size = 0
+        self._object_sizes: Dict[int, int] = {}
+        self._size_counts: Dict[int, int] = {}
+        # Negated sizes, entries of sizes no longer held are dropped lazily
+        self._size_heap: List[int] = []
+        self._heaped_sizes: Set[int] = set()
+        self._state_counts: Dict[Hashable, int] = {}
+        self._labels = self._set_labels(labels)
+        self._label_cache = get_label_cache()
+        self._stamp_cache = get_stamp_cache()
+        # Container rectangle, visible items and their bounds of the last layout
+        self._layout_rect: Optional[pygame.Rect] = None
+        self._layout_items: List[Tuple[GDrawable, pygame.Rect]] = []
+        self._layout_bounds: Optional[pygame.Rect] = None
 
     def __len__(self):
         return len(self._objects)
@@ -149,9 +172,25 @@ class GContainerBase(ABC):
     def id(self) -> int:
         return self._id
 
+    @property
+    def max_object_size(self) -> int:
+        """Size of the biggest held object"""
+        return self._max_object_size
+
+    @property
+    def total_object_size(self) -> int:
+        """Sum of sizes of all held objects"""
+        return self._total_object_size
+
+    @property
+    def state_counts(self) -> Dict[Hashable, int]:
+        """Count of held simulation objects in every state, objects without \
+            states are not counted"""
+        return dict(self._state_counts)
+
     @property
     def size(self) -> Tuple[int, int]:
-        return self._position
+        return self._size
 
     @size.setter
     def size(self, s: Tuple[int, int]):
@@ -159,6 +198,8 @@ class GContainerBase(ABC):
             raise ValueError("Negative or zero values supplied to size")
 
         self._size = s
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def position(self) -> Tuple[int, int]:
@@ -171,6 +212,8 @@ class GContainerBase(ABC):
                 raise ValueError("Negative values supplied to position")
 
         self._position = p
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def shape(self) -> GShape:
@@ -186,6 +229,7 @@ class GContainerBase(ABC):
             s.border_size = -1
 
         self._shape = s
+        self.mark_dirty()
 
     @property
     def align(self) -> GAlign:
@@ -200,6 +244,8 @@ class GContainerBase(ABC):
             raise ValueError("Invalid align value supplied")
 
         self._align = a
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def fill_direction(self) -> GFillDirection:
@@ -223,6 +269,8 @@ class GContainerBase(ABC):
             raise ValueError("Invalid overflow value supplied")
 
         self._overflow = o
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def padding(self) -> int:
@@ -234,6 +282,8 @@ class GContainerBase(ABC):
             raise ValueError("Negative padding supplied")
 
         self._padding = p
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def spacing(self) -> int:
@@ -245,10 +295,12 @@ class GContainerBase(ABC):
             raise ValueError("Negative spacing supplied")
 
         self._spacing = s
+        self._invalidate_layout()
+        self.mark_dirty()
 
     @property
     def reverse(self) -> bool:
-        return self.reverse
+        return self._reverse
 
     @reverse.setter
     def reverse(self, r: bool):
@@ -256,6 +308,19 @@ class GContainerBase(ABC):
             raise ValueError("Invalid reverse type supplied")
 
         self._reverse = r
+        self._invalidate_layout()
+        self.mark_dirty()
+
+    @property
+    def labels(self) -> bool:
+        """If ids of items are drawn"""
+        return self._labels
+
+    @labels.setter
+    def labels(self, d: bool):
+        self._labels = self._set_labels(d)
+        self._invalidate_layout()
+        self.mark_dirty()
 
     # Main functionality
 
@@ -266,10 +331,14 @@ class GContainerBase(ABC):
         :type obj: GDrawable
         :raises Exception: if object is already in this container
         """
-        if f"{id(obj)}" in self._objects:
+        if id(obj) in self._objects:
             raise Exception("Object already in this container")
-        self._objects[f"{id(obj)}"] = obj
-        self._max_object_size = self._set_max_object_size()
+        self._objects[id(obj)] = obj
+        obj._owners[id(self)] = self
+        self._add_member(obj)
+        self._invalidate_layout()
+        self.mark_dirty()
+        obj._entered(self)
 
     def leave(self, obj: GDrawable):
         """Remove object from this container
@@ -278,10 +347,128 @@ class GContainerBase(ABC):
         :type obj: GDrawable
         :raises Exception: if object is not in this container
         """
-        if f"{id(obj)}" not in self._objects:
+        if id(obj) not in self._objects:
             raise Exception("Object not in this container")
-        del self._objects[f"{id(obj)}"]
-        self._max_object_size = self._set_max_object_size()
+        del self._objects[id(obj)]
+        obj._owners.pop(id(self), None)
+        self._remove_member(obj)
+        self._invalidate_layout()
+        self.mark_dirty()
+        obj._left(self)
+
+    # Drawing
+
+    def draw(self, screen: Surface, dt: float) -> None:
+        position_rect = self._get_rect(screen)
+
+        self._draw_background(screen, position_rect)
+
+        self._draw_items(screen, self._get_layout(position_rect))
+
+    def bounds(self, screen: Surface) -> Optional[pygame.Rect]:
+        position_rect = self._get_rect(screen)
+        items = self._get_layout(position_rect)
+
+        if self._layout_bounds is None:
+            rects: List[pygame.Rect] = []
+            for o, item_rect in items:
+                rects.append(item_rect)
+                if self._labels:
+                    rects.append(self._label_rect(o, item_rect))
+            self._layout_bounds = position_rect.unionall(rects)
+
+        return self._layout_bounds.copy()
+
+    @abstractmethod
+    def _layout(self, rect: pygame.Rect) -> List[Tuple[GDrawable, pygame.Rect]]:
+        """Positions visible container items
+
+        :param rect: Container rectangle on the screen
+        :type rect: pygame.Rect
+        :return: Visible items with their rectangles
+        :rtype: List[Tuple[GDrawable, pygame.Rect]]
+        """
+        pass
+
+    def _get_layout(self, rect: pygame.Rect) -> List[Tuple[GDrawable, pygame.Rect]]:
+        # Items are positioned again only after members or settings changed,
+        # or the aligned container moved with the screen size
+        if self._layout_rect != rect:
+            self._layout_items = self._layout(rect)
+            self._layout_rect = rect
+            self._layout_bounds = None
+        return self._layout_items
+
+    def _invalidate_layout(self) -> None:
+        self._layout_rect = None
+
+    def _resized(self, obj: GDrawable) -> None:
+        self._remove_member(obj)
+        self._add_member(obj)
+        self._invalidate_layout()
+
+    def _state_changed(self, obj: GDrawable, old: Hashable, new: Hashable) -> None:
+        self._count_state(old, -1)
+        self._count_state(new, 1)
+
+    def _get_rect(self, screen: Surface) -> pygame.Rect:
+        x_pos, y_pos = self._position
+        width, height = self._size
+
+        bg_rect = pygame.Rect(x_pos, y_pos, width, height)
+
+        return get_align_position(screen, bg_rect, self._position, self._align)
+
+    def _draw_background(self, screen: Surface, rect: pygame.Rect) -> None:
+        if self._shape.shape_type == GShapeType.Square:
+            pygame.draw.rect(
+                screen,
+                DefaultColors.White._get_color,
+                rect,
+                self.shape.border_size,
+            )
+        else:
+            pygame.draw.ellipse(
+                screen,
+                DefaultColors.White._get_color,
+                rect,
+                self.shape.border_size,
+            )
+
+    def _draw_items(
+        self, screen: Surface, items: List[Tuple[GDrawable, pygame.Rect]]
+    ) -> None:
+        # Stamps and labels in a single batch, every label is blitted right
+        # after its item so overlapping items keep covering it
+        stamp = self._stamp_cache.stamp
+        offset = self._max_object_size / 4
+        blits: List[Tuple[Surface, Tuple[float, float]]] = []
+
+        if self._labels:
+            render = self._label_cache.render
+            for o, rect in items:
+                blits.append((stamp(o.shape), rect.topleft))
+                # Position label by the item rect, drawn rect is clipped to the screen
+                blits.append(
+                    (
+                        render(f"{o.id}"),  # type: ignore
+                        (rect.centerx - offset, rect.centery - offset),
+                    )
+                )
+        else:
+            for o, rect in items:
+                blits.append((stamp(o.shape), rect.topleft))
+
+        screen.blits(blits, False)
+
+    def _label_rect(self, o: GDrawable, rect: pygame.Rect) -> pygame.Rect:
+        w, h = self._label_cache.size(f"{o.id}")  # type: ignore
+        return pygame.Rect(
+            rect.center[0] - (self._max_object_size / 4),
+            rect.center[1] - (self._max_object_size / 4),
+            w + 1,
+            h + 1,
+        )
 
     # Helpers
 
@@ -290,13 +477,47 @@ class GContainerBase(ABC):
             return GShape(GShapeType.Square, 10, 2, DefaultColors.White._get_color)
         return s
 
-    def _set_max_object_size(self) -> int:
-        obj_entries: List[GDrawable] = list(self._objects.values())
-        if len(obj_entries) == 0:
-            return 0
-        biggest_size = list(map(lambda o: o.shape.size, obj_entries))
-        biggest_size.sort(reverse=True)
-        return biggest_size[0]
+    def _set_labels(self, d: bool) -> bool:
+        if not isinstance(d, bool):
+            raise ValueError("Invalid labels type supplied")
+
+        return d
+
+    def _add_member(self, obj: GDrawable) -> None:
+        size = obj.shape.size
+        self._object_sizes[id(obj)] = size
+        self._total_object_size += size
+        self._size_counts[size] = self._size_counts.get(size, 0) + 1
+        if size not in self._heaped_sizes:
+            self._heaped_sizes.add(size)
+            heapq.heappush(self._size_heap, -size)
+        if size > self._max_object_size:
+            self._max_object_size = size
+        self._count_state(obj._get_state(), 1)
+
+    def _remove_member(self, obj: GDrawable) -> None:
+        size = self._object_sizes.pop(id(obj))
+        self._total_object_size -= size
+        n = self._size_counts[size] - 1
+        if n > 0:
+            self._size_counts[size] = n
+        else:
+            del self._size_counts[size]
+            # Only the biggest size has to be held, stale entries below it stay
+            heap = self._size_heap
+            while heap and -heap[0] not in self._size_counts:
+                self._heaped_sizes.discard(-heapq.heappop(heap))
+            self._max_object_size = -heap[0] if heap else 0
+        self._count_state(obj._get_state(), -1)
+
+    def _count_state(self, state: Optional[Hashable], n: int) -> None:
+        if state is None:
+            return
+        total = self._state_counts.get(state, 0) + n
+        if total > 0:
+            self._state_counts[state] = total
+        else:
+            del self._state_counts[state]
 
 
 class GContainerRow(GContainerBase, GDrawable):
@@ -311,6 +532,7 @@ class GContainerRow(GContainerBase, GDrawable):
         padding: int = 5,
         spacing: int = 5,
         reverse: bool = False,
+        labels: bool = True,
     ) -> None:
         super().__init__(
             size,
@@ -322,10 +544,9 @@ class GContainerRow(GContainerBase, GDrawable):
             padding,
             spacing,
             reverse,
+            labels,
         )
 
-        self._font = pygame.font.Font(None, 20)
-
     @GContainerBase.fill_direction.setter
     def fill_direction(self, f: GFillDirection):
         if not isinstance(f, GFillDirection):
@@ -344,41 +565,24 @@ class GContainerRow(GContainerBase, GDrawable):
             n_f = f
 
         self._fill_direction = n_f
+        self._invalidate_layout()
+        self.mark_dirty()
 
-    def draw(self, screen: Surface, dt: float) -> None:
-        x_pos, y_pos = self._position
-        width, height = self._size
-
-        bg_rect = pygame.Rect(x_pos, y_pos, width, height)
-
-        position_rect = get_align_position(screen, bg_rect, self._position, self._align)
-
-        x = position_rect.x
-        y = position_rect.y
-
-        if self._shape.shape_type == GShapeType.Square:
-            pygame.draw.rect(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
-        else:
-            pygame.draw.ellipse(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
+    def _layout(self, rect: pygame.Rect) -> List[Tuple[GDrawable, pygame.Rect]]:
+        x = rect.x
+        y = rect.y
+        width = rect.w
 
         if len(self._objects) == 0:
-            return
+            return []
 
         obj_entries: List[GDrawable] = list(self._objects.values())
 
         if self._reverse:
             obj_entries.reverse()
 
+        items: List[Tuple[GDrawable, pygame.Rect]] = []
+
         for i, o in enumerate(obj_entries):
             size = o.shape.size
             x_l = (
@@ -402,28 +606,9 @@ class GContainerRow(GContainerBase, GDrawable):
                     if x_l + self._max_object_size > x + width:
                         continue
 
-            f_rect = (
-                pygame.draw.rect(
-                    screen,
-                    o.shape.color,
-                    pygame.Rect(x_l, y_l, size, size),
-                )
-                if o.shape.shape_type == GShapeType.Square
-                else pygame.draw.ellipse(
-                    screen,
-                    o.shape.color,
-                    pygame.Rect(x_l, y_l, size, size),
-                )
-            )
+            items.append((o, pygame.Rect(x_l, y_l, size, size)))
 
-            text_surface = self._font.render(f"{o.id}", 1, (0, 0, 0))  # type: ignore
-            screen.blit(
-                text_surface,
-                (
-                    f_rect.center[0] - (self._max_object_size / 4),
-                    f_rect.center[1] - (self._max_object_size / 4),
-                ),
-            )
+        return items
 
 
 class GContainerColumn(GContainerBase, GDrawable):
@@ -438,6 +623,7 @@ class GContainerColumn(GContainerBase, GDrawable):
         padding: int = 5,
         spacing: int = 5,
         reverse: bool = False,
+        labels: bool = True,
     ) -> None:
         super().__init__(
             size,
@@ -449,8 +635,8 @@ class GContainerColumn(GContainerBase, GDrawable):
             padding,
             spacing,
             reverse,
+            labels,
         )
-        self._font = pygame.font.Font(None, 20)
 
     @GContainerBase.fill_direction.setter
     def fill_direction(self, f: GFillDirection):
@@ -470,41 +656,24 @@ class GContainerColumn(GContainerBase, GDrawable):
             n_f = f
 
         self._fill_direction = n_f
+        self._invalidate_layout()
+        self.mark_dirty()
 
-    def draw(self, screen: Surface, dt: float) -> None:
-        x_pos, y_pos = self._position
-        width, height = self._size
-
-        bg_rect = pygame.Rect(x_pos, y_pos, width, height)
-
-        position_rect = get_align_position(screen, bg_rect, self._position, self._align)
-
-        x = position_rect.x
-        y = position_rect.y
-
-        if self._shape.shape_type == GShapeType.Square:
-            pygame.draw.rect(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
-        else:
-            pygame.draw.ellipse(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
+    def _layout(self, rect: pygame.Rect) -> List[Tuple[GDrawable, pygame.Rect]]:
+        x = rect.x
+        y = rect.y
+        height = rect.h
 
         if len(self._objects) == 0:
-            return
+            return []
 
         obj_entries: List[GDrawable] = list(self._objects.values())
 
         if self._reverse:
             obj_entries.reverse()
 
+        items: List[Tuple[GDrawable, pygame.Rect]] = []
+
         for i, o in enumerate(obj_entries):
             size = o.shape.size
             x_l = x + self._padding
@@ -528,28 +697,9 @@ class GContainerColumn(GContainerBase, GDrawable):
                     if y_l + self._max_object_size > y + height:
                         continue
 
-            f_rect = (
-                pygame.draw.rect(
-                    screen,
-                    o.shape.color,
-                    pygame.Rect(x_l, y_l, size, size),
-                )
-                if o.shape.shape_type == GShapeType.Square
-                else pygame.draw.ellipse(
-                    screen,
-                    o.shape.color,
-                    pygame.Rect(x_l, y_l, size, size),
-                )
-            )
+            items.append((o, pygame.Rect(x_l, y_l, size, size)))
 
-            text_surface = self._font.render(f"{o.id}", 1, (0, 0, 0))  # type: ignore
-            screen.blit(
-                text_surface,
-                (
-                    f_rect.center[0] - (self._max_object_size / 4),
-                    f_rect.center[1] - (self._max_object_size / 4),
-                ),
-            )
+        return items
 
 
 class GcontainerGrid(GContainerBase, GDrawable):
@@ -564,6 +714,7 @@ class GcontainerGrid(GContainerBase, GDrawable):
         padding: int = 5,
         spacing: int = 5,
         reverse: bool = False,
+        labels: bool = True,
     ) -> None:
         super().__init__(
             size,
@@ -575,8 +726,8 @@ class GcontainerGrid(GContainerBase, GDrawable):
             padding,
             spacing,
             reverse,
+            labels,
         )
-        self._font = pygame.font.Font(None, 20)
 
     @GContainerBase.fill_direction.setter
     def fill_direction(self, f: GFillDirection):
@@ -596,35 +747,17 @@ class GcontainerGrid(GContainerBase, GDrawable):
             n_f = f
 
         self._fill_direction = n_f
+        self._invalidate_layout()
+        self.mark_dirty()
 
-    def draw(self, screen: Surface, dt: float) -> None:
-        x_pos, y_pos = self._position
-        width, height = self._size
-
-        bg_rect = pygame.Rect(x_pos, y_pos, width, height)
-
-        position_rect = get_align_position(screen, bg_rect, self._position, self._align)
-
-        x = position_rect.x
-        y = position_rect.y
-
-        if self._shape.shape_type == GShapeType.Square:
-            pygame.draw.rect(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
-        else:
-            pygame.draw.ellipse(
-                screen,
-                DefaultColors.White._get_color,
-                position_rect,
-                self.shape.border_size,
-            )
+    def _layout(self, rect: pygame.Rect) -> List[Tuple[GDrawable, pygame.Rect]]:
+        x = rect.x
+        y = rect.y
+        width = rect.w
+        height = rect.h
 
         if len(self._objects) == 0:
-            return
+            return []
 
         obj_entries: List[GDrawable] = list(self._objects.values())
 
@@ -645,6 +778,8 @@ class GcontainerGrid(GContainerBase, GDrawable):
         #     max_grid_h = math.floor(height / (self._max_object_size + self._spacing))
         #     obj_entries_chunked = list(array_chunks(obj_entries, max_grid_h))
 
+        items: List[Tuple[GDrawable, pygame.Rect]] = []
+
         for j, o_a in enumerate(obj_entries_chunked):
             for i, o in enumerate(o_a):
                 size = o.shape.size
@@ -730,27 +865,6 @@ class GcontainerGrid(GContainerBase, GDrawable):
                         if y_l < y:
                             continue
 
-                f_rect = (
-                    pygame.draw.rect(
-                        screen,
-                        o.shape.color,
-                        pygame.Rect(x_l, y_l, size, size),
-                    )
-                    if o.shape.shape_type == GShapeType.Square
-                    else pygame.draw.ellipse(
-                        screen,
-                        o.shape.color,
-                        pygame.Rect(x_l, y_l, size, size),
-                    )
-                )
+                items.append((o, pygame.Rect(x_l, y_l, size, size)))
 
-                text_surface = self._font.render(
-                    f"{o.id}", True, (0, 0, 0)  # type: ignore
-                )
-                screen.blit(
-                    text_surface,
-                    (
-                        f_rect.center[0] - (self._max_object_size / 4),
-                        f_rect.center[1] - (self._max_object_size / 4),
-                    ),
-                )
+        return items
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Dict, Hashable, Optional
 from abc import ABC, abstractmethod
 
+import pygame
 from pygame.surface import Surface
 
 from .shape import GShape, GShapeType
@@ -10,8 +11,13 @@ from .color import DefaultColors
 class GDrawable(ABC):
     """Base class providing drawable functions to simulation classes"""
 
+    __slots__ = ("_shape", "_dirty", "_drawn_rect", "_owners")
+
     def __init__(self, shape: Optional[GShape] = None) -> None:
         self._shape = self._set_shape(shape)
+        self._dirty = True
+        self._drawn_rect: Optional[pygame.Rect] = None
+        self._owners: Dict[int, GDrawable] = {}
 
     def __call__(self, screen: Surface, dt: float) -> None:
         """Calls the drawing function when class called as function
@@ -30,6 +36,14 @@ class GDrawable(ABC):
     @shape.setter
     def shape(self, s: GShape) -> None:
         self._shape = self._set_shape(s)
+        for owner in self._owners.values():
+            owner._resized(self)
+        self.mark_dirty()
+
+    @property
+    def dirty(self) -> bool:
+        """If the drawable changed since it was last drawn"""
+        return self._dirty
 
     @property
     def Shape(self) -> Optional[GShape]:
@@ -53,9 +67,70 @@ class GDrawable(ABC):
         """
         pass
 
+    def bounds(self, screen: Surface) -> Optional[pygame.Rect]:
+        """Screen area the next draw call will cover, can be overidden.
+
+        Used by dirty rectangle rendering, ``None`` means the area is unknown \
+            and the whole screen is repainted when this drawable changes.
+
+        :param screen: Screen this object is drawn on
+        :type screen: pygame.Surface
+        :return: Covered area or None
+        :rtype: Optional[pygame.Rect]
+        """
+        return None
+
+    # Dirty tracking
+
+    def mark_dirty(self) -> None:
+        """Marks this drawable and every container holding it to be redrawn"""
+        self._dirty = True
+        for owner in self._owners.values():
+            owner.mark_dirty()
+
+    def _mark_drawn(self, rect: Optional[pygame.Rect]) -> None:
+        self._dirty = False
+        self._drawn_rect = rect
+
+    # Container hooks
+
+    def _entered(self, container: "GDrawable") -> None:
+        """Called after the drawable entered the container"""
+        pass
+
+    def _left(self, container: "GDrawable") -> None:
+        """Called after the drawable left the container"""
+        pass
+
+    def _resized(self, obj: "GDrawable") -> None:
+        """Called on the container after the held drawable changed its shape"""
+        pass
+
+    def _state_changed(self, obj: "GDrawable", old: Hashable, new: Hashable) -> None:
+        """Called on the container after the held drawable changed its state"""
+        pass
+
+    def _get_state(self) -> Optional[Hashable]:
+        """State counted by containers holding the drawable, None if stateless"""
+        return None
+
     # Helpers
 
+    def _reuse(self, shape: Optional[GShape] = None) -> None:
+        # Pooled drawable takes the shape values into its own shape object
+        source = self._get_shape(shape)
+        target = self._shape
+        target.shape_type = source.shape_type
+        target.size = source.size
+        target.border_size = source.border_size
+        target.color = source.color
+        self._dirty = True
+        self._drawn_rect = None
+
     def _set_shape(self, shape: Optional[GShape]) -> GShape:
+        return self._get_shape(shape).copy()
+
+    def _get_shape(self, shape: Optional[GShape]) -> GShape:
         target_shape = None
 
         if self.Shape is not None:
@@ -76,4 +151,4 @@ class GDrawable(ABC):
         if target_shape.shape_type.name not in vals:
             raise ValueError("Invalid shape type supplied")
 
-        return target_shape.copy()
+        return target_shape
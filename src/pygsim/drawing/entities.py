@@ -0,0 +1,375 @@
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pygame
+from pygame.surface import Surface
+
+from .color import GStateColorMapper, GStateColorMapperMeta
+from .drawable import GDrawable
+from .shape import GShapeType
+
+Indices = Union[int, Sequence[int], np.ndarray]
+
+
+class GEntityStore(GDrawable):
+    """Struct-of-arrays collection of lightweight entities
+
+    Entities have no simulation process or Python object of their own, \
+        their state, color index, size and position are kept in NumPy arrays \
+        and changed in bulk. The whole store is a single drawable, entities \
+        are painted as filled squares or circles directly into screen pixels.
+
+    Entity indices are stable, removed slots are reused by later additions.
+
+    :param states: State to color mapper of the entities
+    :type states: GStateColorMapperMeta
+    :param capacity: Initial count of slots, grows when exceeded, \
+        defaults to 1024
+    :type capacity: int, optional
+    :param shape_type: Painted shape, defaults to GShapeType.Square
+    :type shape_type: GShapeType, optional
+    :param size: Default entity size in pixels, defaults to 4
+    :type size: int, optional
+    """
+
+    def __init__(
+        self,
+        states: GStateColorMapperMeta,
+        capacity: int = 1024,
+        shape_type: GShapeType = GShapeType.Square,
+        size: int = 4,
+    ) -> None:
+        super().__init__()
+
+        self._states: List[GStateColorMapper] = list(
+            states._state_table  # type: ignore
+        )
+        self._palette = np.array(
+            [tuple(c)[:3] for c in states._color_table], np.uint8  # type: ignore
+        )
+        self._shape_type = self._set_shape_type(shape_type)
+        self._size = self._set_size(size)
+        self._masks: Dict[Tuple[GShapeType, int], Tuple[List[int], List[int]]] = {}
+
+        capacity = self._set_capacity(capacity)
+        self._state = np.zeros(capacity, np.int32)
+        self._color = np.zeros(capacity, np.int32)
+        self._sizes = np.zeros(capacity, np.int32)
+        self._position = np.zeros((capacity, 2), np.float64)
+        self._alive = np.zeros(capacity, np.bool_)
+        self._free: List[int] = []
+        self._used = 0
+
+    def __len__(self) -> int:
+        return self._used - len(self._free)
+
+    # Properities
+
+    @property
+    def states(self) -> List[GStateColorMapper]:
+        """States in the order of their indices"""
+        return self._states
+
+    @property
+    def capacity(self) -> int:
+        return len(self._alive)
+
+    @property
+    def state(self) -> np.ndarray:
+        """State indices of all slots, read only view"""
+        return self._readonly(self._state)
+
+    @property
+    def color(self) -> np.ndarray:
+        """Color indices of all slots, read only view"""
+        return self._readonly(self._color)
+
+    @property
+    def size(self) -> np.ndarray:
+        """Sizes of all slots, read only view"""
+        return self._readonly(self._sizes)
+
+    @property
+    def position(self) -> np.ndarray:
+        """Center positions of all slots, read only view"""
+        return self._readonly(self._position)
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Mask of used slots, read only view"""
+        return self._readonly(self._alive)
+
+    # Main functionality
+
+    def add(
+        self,
+        count: int = 1,
+        state: Optional[GStateColorMapper] = None,
+        position: Optional[np.ndarray] = None,
+        size: Optional[int] = None,
+    ) -> np.ndarray:
+        """Adds entities
+
+        :param count: Count of added entities, defaults to 1
+        :type count: int, optional
+        :param state: Initial state, defaults to None (the first state)
+        :type state: Optional[GStateColorMapper], optional
+        :param position: Position or positions of shape (count, 2), \
+            defaults to None (0, 0)
+        :type position: Optional[np.ndarray], optional
+        :param size: Size in pixels, defaults to None (store size)
+        :type size: Optional[int], optional
+        :return: Indices of added entities
+        :rtype: np.ndarray
+        """
+        if count <= 0:
+            raise ValueError("Zero or negative entity count supplied")
+
+        reused = self._free[-count:][::-1]
+        del self._free[len(self._free) - len(reused) :]
+
+        fresh = count - len(reused)
+        if self._used + fresh > self.capacity:
+            self._grow(self._used + fresh)
+        indices = np.concatenate(
+            [
+                np.array(reused, np.intp),
+                np.arange(self._used, self._used + fresh, dtype=np.intp),
+            ]
+        )
+        self._used += fresh
+
+        s = self._get_state_index(state)
+        self._alive[indices] = True
+        self._state[indices] = s
+        self._color[indices] = s
+        self._sizes[indices] = self._size if size is None else self._set_size(size)
+        self._position[indices] = 0 if position is None else position
+
+        self.mark_dirty()
+        return indices
+
+    def remove(self, indices: Indices) -> None:
+        """Removes entities, their slots are reused
+
+        :param indices: Entity indices
+        :type indices: Union[int, Sequence[int], np.ndarray]
+        """
+        indices = np.unique(np.asarray(indices, np.intp))
+        indices = indices[self._alive[indices]]
+        self._alive[indices] = False
+        self._free.extend(indices.tolist())
+        self.mark_dirty()
+
+    def set_state(self, indices: Indices, state: GStateColorMapper) -> None:
+        """Changes state of entities, their color follows the state
+
+        :param indices: Entity indices or mask
+        :type indices: Union[int, Sequence[int], np.ndarray]
+        :param state: New state
+        :type state: GStateColorMapper
+        """
+        s = self._get_state_index(state)
+        self._state[indices] = s
+        self._color[indices] = s
+        self.mark_dirty()
+
+    def set_color(self, indices: Indices, color: GStateColorMapper) -> None:
+        """Changes color of entities without changing their state
+
+        :param indices: Entity indices or mask
+        :type indices: Union[int, Sequence[int], np.ndarray]
+        :param color: State whose color is used
+        :type color: GStateColorMapper
+        """
+        self._color[indices] = self._get_state_index(color)
+        self.mark_dirty()
+
+    def set_position(self, indices: Indices, position: np.ndarray) -> None:
+        """Moves entities
+
+        :param indices: Entity indices or mask
+        :type indices: Union[int, Sequence[int], np.ndarray]
+        :param position: Position or positions of shape (count, 2)
+        :type position: np.ndarray
+        """
+        self._position[indices] = position
+        self.mark_dirty()
+
+    def set_size(self, indices: Indices, size: Union[int, np.ndarray]) -> None:
+        """Resizes entities
+
+        :param indices: Entity indices or mask
+        :type indices: Union[int, Sequence[int], np.ndarray]
+        :param size: Size or sizes in pixels
+        :type size: Union[int, np.ndarray]
+        """
+        if np.any(np.asarray(size) <= 0):
+            raise ValueError("Zero or negative size supplied")
+
+        self._sizes[indices] = size
+        self.mark_dirty()
+
+    def select(self, state: Optional[GStateColorMapper] = None) -> np.ndarray:
+        """Gets indices of living entities
+
+        :param state: Only entities in the state, defaults to None (all)
+        :type state: Optional[GStateColorMapper], optional
+        :rtype: np.ndarray
+        """
+        used = slice(0, self._used)
+        if state is None:
+            return np.flatnonzero(self._alive[used])
+        mask = self._alive[used] & (self._state[used] == self._get_state_index(state))
+        return np.flatnonzero(mask)
+
+    def counts(self) -> Dict[GStateColorMapper, int]:
+        """Count of living entities in every state
+
+        :rtype: Dict[GStateColorMapper, int]
+        """
+        used = slice(0, self._used)
+        counts = np.bincount(
+            self._state[used][self._alive[used]], minlength=len(self._states)
+        )
+        return {s: int(c) for s, c in zip(self._states, counts)}
+
+    def arrange(self, rect: pygame.Rect, spacing: int = 2) -> None:
+        """Lays living entities out row by row inside of the rectangle, \
+            in order of their indices
+
+        :param rect: Target area
+        :type rect: pygame.Rect
+        :param spacing: Space between entities, defaults to 2
+        :type spacing: int, optional
+        """
+        indices = self.select()
+        if len(indices) == 0:
+            return
+
+        cell = int(self._sizes[indices].max()) + spacing
+        columns = max(rect.width // cell, 1)
+        order = np.arange(len(indices))
+        self._position[indices, 0] = rect.x + (order % columns) * cell + cell / 2
+        self._position[indices, 1] = rect.y + (order // columns) * cell + cell / 2
+        self.mark_dirty()
+
+    # Drawing
+
+    def draw(self, screen: Surface, dt: float) -> None:
+        indices = self.select()
+        if len(indices) == 0:
+            return
+
+        clip = screen.get_clip()
+        sizes = self._sizes[indices]
+        centers = np.rint(self._position[indices]).astype(np.intp)
+
+        # Mapped surface colors are written once per pixel, 24 bit surfaces
+        # have no 2D pixel view and get RGB written per channel
+        if screen.get_bytesize() == 3:
+            pixels = pygame.surfarray.pixels3d(screen)
+            colors = self._palette[self._color[indices]]
+        else:
+            pixels = pygame.surfarray.pixels2d(screen)
+            palette = np.array(
+                [screen.map_rgb(tuple(c)) for c in self._palette], pixels.dtype
+            )
+            colors = palette[self._color[indices]]
+
+        uniform = sizes.min() == sizes.max()
+        for size in sizes[:1] if uniform else np.unique(sizes):
+            selected = slice(None) if uniform else sizes == size
+            xs, ys, painted = (
+                centers[selected, 0],
+                centers[selected, 1],
+                colors[selected],
+            )
+
+            # One vectorized paint of all entities per pixel of the shape
+            for dx, dy in zip(*self._get_mask(int(size))):
+                x, y = xs + dx, ys + dy
+                inside = (
+                    (x >= clip.left)
+                    & (x < clip.right)
+                    & (y >= clip.top)
+                    & (y < clip.bottom)
+                )
+                pixels[x[inside], y[inside]] = painted[inside]
+
+        del pixels
+
+    def bounds(self, screen: Surface) -> Optional[pygame.Rect]:
+        indices = self.select()
+        if len(indices) == 0:
+            return pygame.Rect(0, 0, 0, 0)
+
+        half = self._sizes[indices, None] / 2
+        low = np.floor((self._position[indices] - half).min(axis=0))
+        high = np.ceil((self._position[indices] + half).max(axis=0))
+        return pygame.Rect(
+            int(low[0]) - 1,
+            int(low[1]) - 1,
+            int(high[0] - low[0]) + 2,
+            int(high[1] - low[1]) + 2,
+        )
+
+    # Helpers
+
+    def _get_mask(self, size: int) -> Tuple[List[int], List[int]]:
+        # Pixel offsets of the shape relative to its center
+        key = (self._shape_type, size)
+        mask = self._masks.get(key)
+        if mask is None:
+            offsets = np.arange(size) - (size - 1) // 2
+            dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+            if self._shape_type == GShapeType.Circle:
+                radius = (size - 1) / 2
+                center = (size - 1) / 2 - (size - 1) // 2
+                inside = (dx - center) ** 2 + (dy - center) ** 2 <= radius**2 + 0.5
+                dx, dy = dx[inside], dy[inside]
+            mask = (dx.ravel().tolist(), dy.ravel().tolist())
+            self._masks[key] = mask
+        return mask
+
+    def _grow(self, required: int) -> None:
+        capacity = max(required, self.capacity * 2)
+        extra = capacity - self.capacity
+        self._state = np.concatenate([self._state, np.zeros(extra, np.int32)])
+        self._color = np.concatenate([self._color, np.zeros(extra, np.int32)])
+        self._sizes = np.concatenate([self._sizes, np.zeros(extra, np.int32)])
+        self._position = np.concatenate(
+            [self._position, np.zeros((extra, 2), np.float64)]
+        )
+        self._alive = np.concatenate([self._alive, np.zeros(extra, np.bool_)])
+
+    def _readonly(self, array: np.ndarray) -> np.ndarray:
+        view = array[: self._used].view()
+        view.flags.writeable = False
+        return view
+
+    def _get_state_index(self, state: Optional[GStateColorMapper]) -> int:
+        if state is None:
+            return 0
+        index = getattr(state, "_state_index", None)
+        if index is None or self._states[index] is not state:
+            raise ValueError("Invalid state value supplied")
+        return index
+
+    def _set_shape_type(self, t: GShapeType) -> GShapeType:
+        if not isinstance(t, GShapeType):
+            raise ValueError("Invalid shape type supplied")
+
+        return t
+
+    def _set_size(self, s: int) -> int:
+        if s <= 0:
+            raise ValueError("Zero or negative size supplied")
+
+        return s
+
+    def _set_capacity(self, c: int) -> int:
+        if c <= 0:
+            raise ValueError("Zero or negative capacity supplied")
+
+        return c
@@ -0,0 +1,121 @@
+from typing import Dict, Tuple
+from collections import OrderedDict
+
+import pygame
+from pygame.surface import Surface
+
+
+class GLabelCache:
+    """Bounded cache of rendered label surfaces
+
+    Rendering text is the most expensive part of drawing container items, \
+        labels are rendered once and reused until the least recently used \
+        ones are evicted. The capacity should exceed the count of labels \
+        visible at once, otherwise every label is rendered again each frame.
+
+    :param size: Font size, defaults to 20
+    :type size: int, optional
+    :param color: Text color, defaults to black
+    :type color: Tuple[int, int, int], optional
+    :param capacity: Count of kept surfaces, defaults to 4096
+    :type capacity: int, optional
+    """
+
+    def __init__(
+        self,
+        size: int = 20,
+        color: Tuple[int, int, int] = (0, 0, 0),
+        capacity: int = 4096,
+    ) -> None:
+        self._font = pygame.font.Font(None, size)
+        self._color = color
+        self._capacity = self._set_capacity(capacity)
+        self._surfaces: "OrderedDict[str, Surface]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    # Properities
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, c: int) -> None:
+        self._capacity = self._set_capacity(c)
+        while len(self._surfaces) > self._capacity:
+            self._surfaces.popitem(last=False)
+
+    @property
+    def hits(self) -> int:
+        """Count of labels served from the cache"""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Count of rendered labels"""
+        return self._misses
+
+    # Main functionality
+
+    def render(self, text: str) -> Surface:
+        """Gets rendered label, the surface is shared and must not be changed
+
+        :param text: Label text
+        :type text: str
+        :rtype: Surface
+        """
+        surface = self._surfaces.get(text)
+        if surface is not None:
+            self._surfaces.move_to_end(text)
+            self._hits += 1
+            return surface
+
+        surface = self._font.render(text, True, self._color)
+        self._surfaces[text] = surface
+        self._misses += 1
+        if len(self._surfaces) > self._capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def size(self, text: str) -> Tuple[int, int]:
+        """Gets size of the rendered label
+
+        :param text: Label text
+        :type text: str
+        :rtype: Tuple[int, int]
+        """
+        return self.render(text).get_size()
+
+    def clear(self) -> None:
+        """Drops all rendered labels"""
+        self._surfaces.clear()
+
+    # Helpers
+
+    def _set_capacity(self, c: int) -> int:
+        if c <= 0:
+            raise ValueError("Zero or negative capacity supplied")
+
+        return c
+
+
+# Keyed by font size
+_label_caches: Dict[int, GLabelCache] = {}
+
+
+def get_label_cache(size: int = 20) -> GLabelCache:
+    """Gets the label cache shared by all containers using the font size
+
+    :param size: Font size, defaults to 20
+    :type size: int, optional
+    :rtype: GLabelCache
+    """
+    cache = _label_caches.get(size)
+    if cache is None:
+        cache = GLabelCache(size)
+        _label_caches[size] = cache
+    return cache
@@ -0,0 +1,183 @@
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
+from itertools import count
+from enum import Enum
+
+from pygame.surface import Surface
+
+DrawCall = Callable[[Surface, float], None]
+
+
+class GLayer(Enum):
+    """Draw call layers, drawn from the lowest value to the highest"""
+
+    Background = 0
+    Objects = 1
+    HUD = 2
+
+
+def get_layer_index(layer: Union[GLayer, int]) -> int:
+    """Gets z-index of the layer
+
+    :param layer: Layer enum or custom z-index
+    :type layer: Union[GLayer, int]
+    :raises ValueError: When other type than GLayer or int supplied.
+    :return: Layer z-index
+    :rtype: int
+    """
+    if isinstance(layer, GLayer):
+        return layer.value
+    if isinstance(layer, int) and not isinstance(layer, bool):
+        return layer
+    raise ValueError("Invalid layer type supplied")
+
+
+class GDrawHandle:
+    """Handle of a registered draw call, removes it in constant time
+
+    :param registry: Registry holding the draw call
+    :type registry: GDrawRegistry
+    :param layer: Layer z-index
+    :type layer: int
+    :param key: Draw call key inside of the layer
+    :type key: int
+    :param draw_call: Registered draw call
+    :type draw_call: Callable[[Surface, float], None]
+    """
+
+    def __init__(
+        self, registry: "GDrawRegistry", layer: int, key: int, draw_call: DrawCall
+    ) -> None:
+        self._registry = registry
+        self._layer = layer
+        self._key = key
+        self._draw_call = draw_call
+
+    @property
+    def layer(self) -> int:
+        return self._layer
+
+    @property
+    def draw_call(self) -> DrawCall:
+        return self._draw_call
+
+    @property
+    def registered(self) -> bool:
+        return self._key in self._registry._layers.get(self._layer, {})
+
+    def remove(self) -> None:
+        """Removes the draw call from its registry"""
+        self._registry.remove(self)
+
+
+class GDrawRegistry:
+    """Draw call pool split into z-ordered layers
+
+    Draw calls are kept in insertion order inside of their layer. Adding \
+        and removing is O(1), iteration goes over a cached snapshot so the \
+        registry can be modified while a frame is drawn.
+    """
+
+    def __init__(self) -> None:
+        self._layers: Dict[int, Dict[int, DrawCall]] = {}
+        self._handles: Dict[int, List[GDrawHandle]] = {}
+        self._disabled: Set[int] = set()
+        self._keys = count(0)
+        self._snapshot: Optional[Tuple[DrawCall, ...]] = None
+
+    def __iter__(self) -> Iterator[DrawCall]:
+        if self._snapshot is None:
+            self._snapshot = tuple(
+                draw_call
+                for layer in sorted(self._layers)
+                if layer not in self._disabled
+                for draw_call in self._layers[layer].values()
+            )
+        return iter(self._snapshot)
+
+    def __len__(self) -> int:
+        return sum(len(draw_calls) for draw_calls in self._layers.values())
+
+    def __contains__(self, draw_call: DrawCall) -> bool:
+        return id(draw_call) in self._handles
+
+    # Main functionality
+
+    def add(
+        self, draw_call: DrawCall, layer: Union[GLayer, int] = GLayer.Objects
+    ) -> GDrawHandle:
+        """Adds draw call to the layer
+
+        :param draw_call: Callable drawing to the screen
+        :type draw_call: Callable[[Surface, float], None]
+        :param layer: Target layer, defaults to GLayer.Objects
+        :type layer: Union[GLayer, int], optional
+        :return: Handle used to remove the draw call
+        :rtype: GDrawHandle
+        """
+        index = get_layer_index(layer)
+        key = next(self._keys)
+        handle = GDrawHandle(self, index, key, draw_call)
+
+        self._layers.setdefault(index, {})[key] = draw_call
+        self._handles.setdefault(id(draw_call), []).append(handle)
+        self._snapshot = None
+
+        return handle
+
+    def remove(self, target: Union[GDrawHandle, DrawCall]) -> Optional[DrawCall]:
+        """Removes draw call by its handle or by the draw call itself
+
+        :param target: Handle or registered draw call
+        :type target: Union[GDrawHandle, Callable[[Surface, float], None]]
+        :return: Removed draw call, None if it was not registered
+        :rtype: Optional[Callable[[Surface, float], None]]
+        """
+        if isinstance(target, GDrawHandle):
+            handle = target
+        else:
+            handles = self._handles.get(id(target))
+            if not handles:
+                return None
+            handle = handles[0]
+
+        draw_calls = self._layers.get(handle._layer, {})
+        if handle._key not in draw_calls:
+            return None
+
+        del draw_calls[handle._key]
+
+        handles = self._handles[id(handle._draw_call)]
+        handles.remove(handle)
+        if len(handles) == 0:
+            del self._handles[id(handle._draw_call)]
+
+        self._snapshot = None
+
+        return handle._draw_call
+
+    def enable_layer(self, layer: Union[GLayer, int]) -> None:
+        """Draws the layer again
+
+        :param layer: Target layer
+        :type layer: Union[GLayer, int]
+        """
+        self._disabled.discard(get_layer_index(layer))
+        self._snapshot = None
+
+    def disable_layer(self, layer: Union[GLayer, int]) -> None:
+        """Stops drawing the layer, its draw calls stay registered
+
+        :param layer: Target layer
+        :type layer: Union[GLayer, int]
+        """
+        self._disabled.add(get_layer_index(layer))
+        self._snapshot = None
+
+    def is_layer_enabled(self, layer: Union[GLayer, int]) -> bool:
+        """Checks if the layer is drawn
+
+        :param layer: Target layer
+        :type layer: Union[GLayer, int]
+        :rtype: bool
+        """
+        return get_layer_index(layer) not in self._disabled
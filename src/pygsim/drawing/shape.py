@@ -1,5 +1,5 @@
 from enum import Enum
-from dataclasses import dataclass, fields
+from dataclasses import dataclass
 import pygame
 
 
@@ -10,13 +10,12 @@ class GShapeType(Enum):
 
 @dataclass
 class GShape:
+    __slots__ = ("shape_type", "size", "border_size", "color")
+
     shape_type: GShapeType
     size: int
     border_size: int
     color: pygame.Color
 
     def copy(self) -> "GShape":
-        clone = GShape(GShapeType.Circle, 10, -1, pygame.Color(0, 0, 0))
-        for field in fields(GShape):
-            setattr(clone, field.name, getattr(self, field.name))
-        return clone
+        return GShape(self.shape_type, self.size, self.border_size, self.color)
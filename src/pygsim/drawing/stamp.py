@@ -0,0 +1,108 @@
+from typing import Dict, Tuple
+
+import pygame
+from pygame.surface import Surface
+
+from .shape import GShape, GShapeType
+
+# Size and packed RGBA color
+StampKey = Tuple[int, int]
+
+
+class GStampCache:
+    """Bounded cache of pre-rendered item shapes
+
+    Container items sharing shape type, size and color are drawn by blitting \
+        the same stamp, which is rendered once. Items are always filled, so \
+        the border size of their shapes does not change the stamp. Stamps \
+        of circles are transparent outside of the circle by a color key.
+
+    Lookups are on the hot path of every drawn item, so instead of tracking \
+        recency all stamps are dropped at once when the capacity is exceeded.
+
+    :param capacity: Count of kept stamps, defaults to 1024
+    :type capacity: int, optional
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = self._set_capacity(capacity)
+        self._squares: Dict[StampKey, Surface] = {}
+        self._circles: Dict[StampKey, Surface] = {}
+
+    def __len__(self) -> int:
+        return len(self._squares) + len(self._circles)
+
+    # Properities
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, c: int) -> None:
+        self._capacity = self._set_capacity(c)
+        if len(self) > self._capacity:
+            self.clear()
+
+    # Main functionality
+
+    def stamp(self, shape: GShape) -> Surface:
+        """Gets rendered shape, the surface is shared and must not be changed
+
+        :param shape: Drawn shape
+        :type shape: GShape
+        :rtype: Surface
+        """
+        circle = shape.shape_type is GShapeType.Circle
+        stamps = self._circles if circle else self._squares
+        color = shape.color
+        if not isinstance(color, pygame.Color):
+            # Tuples and color names are keyed by the same packed value
+            color = pygame.Color(color)
+        key = (shape.size, int(color))
+        surface = stamps.get(key)
+        if surface is None:
+            if len(self) >= self._capacity:
+                self.clear()
+            surface = self._render(circle, shape.size, color)
+            stamps[key] = surface
+        return surface
+
+    def clear(self) -> None:
+        """Drops all rendered stamps"""
+        self._squares.clear()
+        self._circles.clear()
+
+    # Helpers
+
+    def _render(self, circle: bool, size: int, color: pygame.Color) -> Surface:
+        surface = Surface((size, size))
+        rgb = (color[0], color[1], color[2])
+        if not circle:
+            surface.fill(rgb)
+            return surface
+
+        # Any color key differing from the circle color
+        key = (0, 0, 0) if rgb != (0, 0, 0) else (255, 255, 255)
+        surface.fill(key)
+        pygame.draw.ellipse(surface, rgb, surface.get_rect())
+        surface.set_colorkey(key, pygame.RLEACCEL)
+        return surface
+
+    def _set_capacity(self, c: int) -> int:
+        if c <= 0:
+            raise ValueError("Zero or negative capacity supplied")
+
+        return c
+
+
+# Shared by all containers, stamps are rendered on first use
+_stamp_cache = GStampCache()
+
+
+def get_stamp_cache() -> GStampCache:
+    """Gets the stamp cache shared by all containers
+
+    :rtype: GStampCache
+    """
+    return _stamp_cache
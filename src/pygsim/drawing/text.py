@@ -39,6 +39,7 @@ class GText(GDrawable):
             raise ValueError("Invalid type for position supplied")
 
         self._position = p
+        self.mark_dirty()
 
     @property
     def align(self) -> GAlign:
@@ -53,6 +54,7 @@ class GText(GDrawable):
             raise ValueError("Invalid align value supplied")
 
         self._align = a
+        self.mark_dirty()
 
     @property
     def text(self) -> str:
@@ -61,6 +63,7 @@ class GText(GDrawable):
     @text.setter
     def text(self, t: Optional[str]):
         self._text = self._set_text(t)
+        self.mark_dirty()
 
     @property
     def size(self) -> int:
@@ -70,6 +73,7 @@ class GText(GDrawable):
     def size(self, s: Optional[int]):
         self._size = self._set_size(s)
         self._font = self._set_font(self._size)
+        self.mark_dirty()
 
     @property
     def color(self) -> pygame.Color:
@@ -78,6 +82,7 @@ class GText(GDrawable):
     @color.setter
     def color(self, c: Optional[pygame.Color]):
         self._color = self._set_color(c)
+        self.mark_dirty()
 
     # Overides
 
@@ -94,6 +99,13 @@ class GText(GDrawable):
         # ToDo: Render background shape -> set text by align in the bounding box
         screen.blit(text_surface, (text_rect.x, text_rect.y))
 
+    def bounds(self, screen: Surface) -> Optional[pygame.Rect]:
+        if not (self._text and self._text.strip()):
+            return pygame.Rect(self._position, (0, 0))
+        w, h = self._font.size(self._text)
+        text_rect = pygame.Rect(self._position[0], self._position[1], w, h)
+        return get_align_position(screen, text_rect, self._position, self._align)
+
     # Helpers
 
     def _set_position(self, p: Tuple[int, int]) -> Tuple[int, int]:
@@ -0,0 +1,188 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from time import perf_counter
+
+import pygame
+from pygame.surface import Surface
+
+from .drawing.color import DefaultColors
+
+
+class GHudItem:
+    """Single line of the HUD
+
+    :param label: Displayed label
+    :type label: str
+    :param value: Callable returning displayed value
+    :type value: Callable[[], Any]
+    :param fmt: Value format, defaults to "{}"
+    :type fmt: str, optional
+    """
+
+    def __init__(self, label: str, value: Callable[[], Any], fmt: str = "{}") -> None:
+        self._label = label
+        self._value = value
+        self._fmt = fmt
+        self._text: Optional[str] = None
+        self._surface: Optional[Surface] = None
+
+    @property
+    def label(self) -> str:
+        return self._label
+
+    @property
+    def text(self) -> Optional[str]:
+        """Currently displayed text"""
+        return self._text
+
+    def _update(self, font: pygame.font.Font, color: pygame.Color) -> bool:
+        text = f"{self._label} = {self._fmt.format(self._value())}"
+        if text == self._text:
+            return False
+        self._text = text
+        self._surface = font.render(text, True, color)
+        return True
+
+
+class GHud:
+    """Debug HUD re-rendering its lines only when displayed values change
+
+    Values are read at most once per refresh interval, between refreshes \
+        the cached text surfaces are blitted.
+
+    :param size: Font size, defaults to 20
+    :type size: int, optional
+    :param position: Position of the first line, defaults to (5, 5)
+    :type position: Tuple[int, int], optional
+    :param spacing: Space between lines, defaults to 5
+    :type spacing: int, optional
+    :param refresh_interval: Wall-clock seconds between value reads, \
+        defaults to 0.25
+    :type refresh_interval: float, optional
+    :param color: Text color, defaults to white
+    :type color: Optional[pygame.Color], optional
+    :param on_refresh: Called before values are read, defaults to None
+    :type on_refresh: Optional[Callable[[], None]], optional
+    """
+
+    def __init__(
+        self,
+        size: int = 20,
+        position: Tuple[int, int] = (5, 5),
+        spacing: int = 5,
+        refresh_interval: float = 0.25,
+        color: Optional[pygame.Color] = None,
+        on_refresh: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._font = pygame.font.Font(None, size)
+        self._position = position
+        self._spacing = spacing
+        self._refresh_interval = self._set_refresh_interval(refresh_interval)
+        self._color = DefaultColors.White._get_color if color is None else color
+        self._on_refresh = on_refresh
+        self._items: Dict[str, GHudItem] = {}
+        self._last_refresh: Optional[float] = None
+        self._changed = True
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    # Properities
+
+    @property
+    def refresh_interval(self) -> float:
+        return self._refresh_interval
+
+    @refresh_interval.setter
+    def refresh_interval(self, r: float):
+        self._refresh_interval = self._set_refresh_interval(r)
+
+    @property
+    def font(self) -> pygame.font.Font:
+        return self._font
+
+    @property
+    def items(self) -> List[GHudItem]:
+        return list(self._items.values())
+
+    # Main functionality
+
+    def add_item(
+        self, label: str, value: Callable[[], Any], fmt: str = "{}"
+    ) -> GHudItem:
+        """Adds HUD line, line with the same label is replaced
+
+        :param label: Displayed label
+        :type label: str
+        :param value: Callable returning displayed value
+        :type value: Callable[[], Any]
+        :param fmt: Value format, defaults to "{}"
+        :type fmt: str, optional
+        :rtype: GHudItem
+        """
+        item = GHudItem(label, value, fmt)
+        self._items[label] = item
+        self._last_refresh = None
+        self._changed = True
+        return item
+
+    def remove_item(self, label: str) -> None:
+        """Removes HUD line
+
+        :param label: Label of the line
+        :type label: str
+        """
+        if self._items.pop(label, None) is not None:
+            self._changed = True
+
+    def update(self, force: bool = False) -> bool:
+        """Reads values when refresh interval elapsed
+
+        :param force: Read values regardless of the interval, defaults to False
+        :type force: bool, optional
+        :return: If any displayed text changed since the last draw
+        :rtype: bool
+        """
+        now = perf_counter()
+        if (
+            force
+            or self._last_refresh is None
+            or now - self._last_refresh >= self._refresh_interval
+        ):
+            self._last_refresh = now
+            if self._on_refresh is not None:
+                self._on_refresh()
+            for item in self._items.values():
+                if item._update(self._font, self._color):
+                    self._changed = True
+
+        return self._changed
+
+    def draw(self, screen: Surface) -> List[pygame.Rect]:
+        """Blits cached lines
+
+        :param screen: Target screen
+        :type screen: pygame.Surface
+        :return: Drawn areas
+        :rtype: List[pygame.Rect]
+        """
+        x, y = self._position
+        rects: List[pygame.Rect] = []
+
+        for item in self._items.values():
+            if item._surface is None:
+                continue
+            rect = screen.blit(item._surface, (x, y))
+            rects.append(rect)
+            y += item._surface.get_height() + self._spacing
+
+        self._changed = False
+
+        return rects
+
+    # Helpers
+
+    def _set_refresh_interval(self, r: float) -> float:
+        if r < 0:
+            raise ValueError("Negative refresh interval supplied")
+
+        return r
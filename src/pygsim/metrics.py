@@ -0,0 +1,292 @@
+from typing import Any, Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from numbers import Integral
+from time import perf_counter
+import json
+import math
+
+# Metric name, labels and value
+Sample = Tuple[str, Dict[str, str], float]
+
+# Help texts of served metrics
+METRICS = {
+    "pygsim_time": "Current simulation time",
+    "pygsim_events_total": "Processed simulation events",
+    "pygsim_frames_total": "Rendered frames",
+    "pygsim_events_per_second": "Processed events per wall-clock second",
+    "pygsim_frames_per_second": "Rendered frames per wall-clock second",
+    "pygsim_speed_ratio": "Simulation time per wall-clock second",
+    "pygsim_lag_seconds": "Wall-clock delay behind the real time schedule",
+    "pygsim_queue_length": "Scheduled simulation events",
+    "pygsim_processes": "Running simulation processes",
+    "pygsim_frame_seconds": "Mean time of a frame phase",
+    "pygsim_container_objects": "Objects held by a container",
+    "pygsim_objects": "Living simulation objects in a state",
+    "pygsim_factory_built_total": "Objects built by a factory",
+}
+
+
+class _GMetricsHandler(BaseHTTPRequestHandler):
+    server: "_GMetricsHTTPServer"
+    # Silent clients are dropped instead of blocking the simulation
+    timeout = 0.1
+
+    def do_GET(self) -> None:
+        if self.path == "/metrics":
+            body = format_prometheus(self.server.metrics.collect())
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body = format_json(self.server.metrics.collect())
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+
+        data = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _GMetricsHTTPServer(HTTPServer):
+    def __init__(self, address: Tuple[str, int], metrics: "GMetricsServer") -> None:
+        super().__init__(address, _GMetricsHandler)
+        self.metrics = metrics
+        # Waiting requests are handled without blocking the simulation
+        self.timeout = 0
+
+
+def escape_label(value: str) -> str:
+    """Escapes Prometheus label value
+
+    :param value: Label value
+    :type value: str
+    :rtype: str
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Formats sample value without losing precision
+
+    >>> format_value(2**60), format_value(0.1), format_value(float("inf"))
+    ('1152921504606846976', '0.1', '+Inf')
+
+    :param value: Sample value
+    :type value: float
+    :rtype: str
+    """
+    if isinstance(value, Integral):
+        return str(int(value))
+
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def format_prometheus(samples: List[Sample]) -> str:
+    """Formats samples in the Prometheus text exposition format
+
+    >>> print(format_prometheus([("pygsim_time", {}, 1.5)]), end="")
+    # HELP pygsim_time Current simulation time
+    # TYPE pygsim_time gauge
+    pygsim_time 1.5
+
+    :param samples: Metric samples
+    :type samples: List[Tuple[str, Dict[str, str], float]]
+    :rtype: str
+    """
+    lines: List[str] = []
+    described = set()
+    for name, labels, value in samples:
+        if name not in described:
+            described.add(name)
+            kind = "counter" if name.endswith("_total") else "gauge"
+            lines.append(f"# HELP {name} {METRICS.get(name, name)}")
+            lines.append(f"# TYPE {name} {kind}")
+        if labels:
+            pairs = ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{pairs}}} {format_value(value)}")
+        else:
+            lines.append(f"{name} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def format_json(samples: List[Sample]) -> str:
+    """Formats samples as JSON object of metric names with lists of \
+        labels and values
+
+    :param samples: Metric samples
+    :type samples: List[Tuple[str, Dict[str, str], float]]
+    :rtype: str
+    """
+    metrics: Dict[str, List[Dict[str, Any]]] = {}
+    for name, labels, value in samples:
+        metrics.setdefault(name, []).append({"labels": labels, "value": value})
+    return json.dumps(metrics)
+
+
+class GMetricsServer:
+    """Serves live metrics of a simulation over HTTP
+
+    ``/metrics`` returns the Prometheus text format, ``/metrics.json`` \
+        returns JSON. Requests are handled by the simulation itself between \
+        frames, or every 4096 events when nothing is rendered, no thread is \
+        started.
+
+    Attached to a simulation via ``env.metrics`` before the model is built, \
+        so all containers, objects and factories are observed. State counts \
+        are read from ``env.statistics``, a collector without per object \
+        totals is attached when there is none. Every metric is kept up to \
+        date as the simulation runs, a request costs time proportional to \
+        the count of metrics, not to the count of objects.
+
+    :param host: Listening address, defaults to "127.0.0.1"
+    :type host: str, optional
+    :param port: Listening port, defaults to 9100, zero picks a free port
+    :type port: int, optional
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9100) -> None:
+        self._host = host
+        self._port = port
+        self._env: Any = None
+        self._server: Optional[_GMetricsHTTPServer] = None
+        # Keyed by container id
+        self._containers: Dict[int, Any] = {}
+        self._last_sample = (perf_counter(), 0.0, 0, 0)
+        self._rates = (0.0, 0.0, 0.0)
+
+    def __enter__(self) -> "GMetricsServer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # Properities
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Listening address, the actual port once opened"""
+        if self._server is None:
+            return (self._host, self._port)
+        return self._server.server_address[:2]  # type: ignore
+
+    @property
+    def is_open(self) -> bool:
+        return self._server is not None
+
+    # Main functionality
+
+    def open(self, env: Any) -> None:
+        """Starts listening, called by the simulation when the server \
+            is attached
+
+        :param env: Served simulation
+        :type env: GSimulation
+        """
+        self._env = env
+        self._last_sample = (
+            perf_counter(),
+            env.now,
+            env.event_count,
+            env.frame_count,
+        )
+        if self._server is None:
+            self._server = _GMetricsHTTPServer((self._host, self._port), self)
+
+    def close(self) -> None:
+        """Stops listening"""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+
+    def poll(self) -> None:
+        """Answers waiting requests without blocking"""
+        if self._server is not None:
+            self._server.handle_request()
+
+    def watch_container(self, container: Any) -> None:
+        """Adds the container to occupancy metrics, called when a simulation \
+            object enters it
+
+        :param container: Observed container
+        :type container: GContainerBase
+        """
+        if container.id not in self._containers:
+            self._containers[container.id] = container
+
+    def collect(self) -> List[Sample]:
+        """Reads current values of all metrics
+
+        :rtype: List[Tuple[str, Dict[str, str], float]]
+        """
+        env = self._env
+        if env is None:
+            return []
+
+        events_per_second, frames_per_second, speed_ratio = self._get_rates()
+        samples: List[Sample] = [
+            ("pygsim_time", {}, float(env.now)),
+            ("pygsim_events_total", {}, env.event_count),
+            ("pygsim_frames_total", {}, env.frame_count),
+            ("pygsim_events_per_second", {}, events_per_second),
+            ("pygsim_frames_per_second", {}, frames_per_second),
+            ("pygsim_speed_ratio", {}, speed_ratio),
+            ("pygsim_lag_seconds", {}, env.lag),
+            ("pygsim_queue_length", {}, env.queue_length),
+            ("pygsim_processes", {}, env.process_count),
+        ]
+
+        if env.profiler is not None:
+            for phase in env.profiler.PHASES:
+                samples.append(
+                    (
+                        "pygsim_frame_seconds",
+                        {"phase": phase},
+                        env.profiler.phase(phase).mean,
+                    )
+                )
+
+        for key, container in self._containers.items():
+            labels = {"container": str(key), "type": type(container).__name__}
+            samples.append(("pygsim_container_objects", labels, len(container)))
+
+        if env.statistics is not None:
+            for cls, counts in env.statistics.counts().items():
+                for state, n in counts.items():
+                    labels = {"class": cls.__name__, "state": state.name}
+                    samples.append(("pygsim_objects", labels, n))
+
+        for factory in env._factories:
+            labels = {"factory": str(factory.id), "type": type(factory).__name__}
+            samples.append(("pygsim_factory_built_total", labels, factory.build_count))
+
+        return samples
+
+    # Helpers
+
+    def _get_rates(self) -> Tuple[float, float, float]:
+        # Rates since the previous request, kept when requested too often
+        env = self._env
+        sample = (perf_counter(), env.now, env.event_count, env.frame_count)
+        wall, now, events, frames = self._last_sample
+        elapsed = sample[0] - wall
+
+        if elapsed >= 0.1:
+            self._rates = (
+                (sample[2] - events) / elapsed,
+                (sample[3] - frames) / elapsed,
+                (sample[1] - now) / elapsed,
+            )
+            self._last_sample = sample
+
+        return self._rates
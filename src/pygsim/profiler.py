@@ -0,0 +1,319 @@
+from typing import Any, Dict, List, Optional, Tuple
+from time import perf_counter
+
+import numpy as np
+import pygame
+from pygame.surface import Surface
+
+
+class GRollingSeries:
+    """Fixed size window of the latest samples
+
+    :param window: Count of kept samples, defaults to 300
+    :type window: int, optional
+    """
+
+    def __init__(self, window: int = 300) -> None:
+        if window <= 0:
+            raise ValueError("Zero or negative window supplied")
+
+        self._samples = np.zeros(window, np.float64)
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    # Main functionality
+
+    def add(self, value: float) -> None:
+        """Adds sample, replacing the oldest one when the window is full
+
+        :param value: Sample value
+        :type value: float
+        """
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % len(self._samples)
+        self._count = min(self._count + 1, len(self._samples))
+
+    @property
+    def values(self) -> np.ndarray:
+        """Samples ordered from the oldest to the latest"""
+        if self._count < len(self._samples):
+            return self._samples[: self._count].copy()
+        return np.roll(self._samples, -self._index)
+
+    @property
+    def last(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return float(self._samples[self._index - 1])
+
+    @property
+    def mean(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return float(self._samples[: self._count].mean())
+
+    @property
+    def max(self) -> float:
+        if self._count == 0:
+            return 0.0
+        return float(self._samples[: self._count].max())
+
+    def percentile(self, q: float) -> float:
+        """Gets q-th percentile of the window
+
+        :param q: Percentile between 0 and 100
+        :type q: float
+        :rtype: float
+        """
+        if self._count == 0:
+            return 0.0
+        return float(np.percentile(self._samples[: self._count], q))
+
+    def histogram(self, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """Histogram of the window
+
+        :param bins: Bin count, defaults to 20
+        :type bins: int, optional
+        :return: Counts and bin edges, see :func:`~numpy.histogram`
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return np.histogram(self._samples[: self._count], bins=bins)
+
+
+class GFrameProfiler:
+    """Measures where the frame time goes.
+
+    Times every draw call, pygame event processing, screen presenting and \
+        simulation steps between frames. Per frame totals are kept in rolling \
+        windows, all times are in seconds.
+
+    :param window: Count of frames kept in statistics, defaults to 300
+    :type window: int, optional
+    :param show_overlay: Draw the slowest drawables over the screen, \
+        defaults to False
+    :type show_overlay: bool, optional
+    :param top: Count of drawables in the overlay, defaults to 5
+    :type top: int, optional
+    """
+
+    PHASES = ("events", "simulation", "draw", "present", "frame")
+
+    def __init__(
+        self, window: int = 300, show_overlay: bool = False, top: int = 5
+    ) -> None:
+        self._window = window
+        self._show_overlay = show_overlay
+        self._top = top
+        self._budget = 0.0
+        self._frame_count = 0
+        self._frame_start = 0.0
+
+        self._phases: Dict[str, GRollingSeries] = {
+            p: GRollingSeries(window) for p in self.PHASES
+        }
+        self._phase_times: Dict[str, float] = {p: 0.0 for p in self.PHASES}
+
+        # Keyed by draw call id
+        self._drawables: Dict[int, Tuple[str, GRollingSeries]] = {}
+        self._last_seen: Dict[int, int] = {}
+        self._draw_times: Dict[int, float] = {}
+        self._labels: Dict[int, str] = {}
+
+    # Properities
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    @property
+    def show_overlay(self) -> bool:
+        return self._show_overlay
+
+    @show_overlay.setter
+    def show_overlay(self, s: bool):
+        self._show_overlay = s
+
+    @property
+    def top(self) -> int:
+        return self._top
+
+    @property
+    def budget(self) -> float:
+        """Frame time budget given by the simulation fps"""
+        return self._budget
+
+    @budget.setter
+    def budget(self, b: float):
+        if b < 0:
+            raise ValueError("Negative budget supplied")
+
+        self._budget = b
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    # Recording
+
+    def begin_frame(self) -> None:
+        """Starts measuring a rendered frame"""
+        self._frame_start = perf_counter()
+
+    def end_frame(self) -> None:
+        """Stores times measured since the last frame into rolling windows"""
+        self._phase_times["frame"] = perf_counter() - self._frame_start
+        self._phase_times["draw"] = sum(self._draw_times.values())
+
+        for phase, series in self._phases.items():
+            series.add(self._phase_times[phase])
+            self._phase_times[phase] = 0.0
+
+        for key, t in self._draw_times.items():
+            entry = self._drawables.get(key)
+            if entry is None:
+                entry = (self._labels[key], GRollingSeries(self._window))
+                self._drawables[key] = entry
+            entry[1].add(t)
+            self._last_seen[key] = self._frame_count
+
+        self._draw_times.clear()
+        self._frame_count += 1
+
+        # Forget drawables which were not drawn for the whole window
+        if self._frame_count % self._window == 0:
+            oldest = self._frame_count - self._window
+            for key in [k for k, f in self._last_seen.items() if f < oldest]:
+                del self._drawables[key]
+                del self._last_seen[key]
+                del self._labels[key]
+
+    def add_phase(self, phase: str, t: float) -> None:
+        """Adds time spent in the phase during the current frame
+
+        :param phase: One of :attr:`PHASES`
+        :type phase: str
+        :param t: Spent time
+        :type t: float
+        """
+        self._phase_times[phase] += t
+
+    def add_draw(self, draw_call: Any, t: float) -> None:
+        """Adds time spent in the draw call during the current frame
+
+        :param draw_call: Measured draw call
+        :type draw_call: Callable[[Surface, float], None]
+        :param t: Spent time
+        :type t: float
+        """
+        key = id(draw_call)
+        if key not in self._labels:
+            self._labels[key] = get_draw_call_label(draw_call)
+        self._draw_times[key] = self._draw_times.get(key, 0.0) + t
+
+    # Statistics
+
+    def phase(self, phase: str) -> GRollingSeries:
+        """Rolling per frame times of the phase
+
+        :param phase: One of :attr:`PHASES`
+        :type phase: str
+        :rtype: GRollingSeries
+        """
+        return self._phases[phase]
+
+    def drawables(self) -> Dict[str, GRollingSeries]:
+        """Rolling per frame times of every measured draw call
+
+        :rtype: Dict[str, GRollingSeries]
+        """
+        return {label: series for label, series in self._drawables.values()}
+
+    def slowest(self, n: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Draw calls with the highest mean draw time
+
+        :param n: Count of draw calls, defaults to None (:attr:`top`)
+        :type n: Optional[int], optional
+        :return: Labels with mean times
+        :rtype: List[Tuple[str, float]]
+        """
+        means = [(label, series.mean) for label, series in self._drawables.values()]
+        means.sort(key=lambda m: m[1], reverse=True)
+        return means[: self._top if n is None else n]
+
+    def by_type(self) -> Dict[str, float]:
+        """Mean per frame draw time summed by draw call type
+
+        :rtype: Dict[str, float]
+        """
+        totals: Dict[str, float] = {}
+        for label, series in self._drawables.values():
+            name = label.split("(")[0]
+            totals[name] = totals.get(name, 0.0) + series.mean
+        return totals
+
+    def report(self) -> str:
+        """Human readable frame budget report
+
+        :rtype: str
+        """
+        lines = [
+            f"Frames: {self._frame_count}, "
+            f"statistics of the last {len(self._phases['frame'])}"
+        ]
+        if self._budget > 0:
+            used = self._phases["frame"].mean + self._phases["simulation"].mean
+            lines.append(
+                f"Budget: {self._budget * 1000:.2f} ms, "
+                f"used {used / self._budget * 100:.1f} %"
+            )
+        for phase, series in self._phases.items():
+            lines.append(
+                f"{phase:>12}: mean {series.mean * 1000:8.3f} ms, "
+                f"p95 {series.percentile(95) * 1000:8.3f} ms, "
+                f"max {series.max * 1000:8.3f} ms"
+            )
+        lines.append("By type:")
+        for name, t in sorted(self.by_type().items(), key=lambda i: -i[1]):
+            lines.append(f"{name:>24}: {t * 1000:8.3f} ms")
+        lines.append("Slowest:")
+        for label, t in self.slowest():
+            lines.append(f"{label:>24}: {t * 1000:8.3f} ms")
+        return "\n".join(lines)
+
+    # Drawing
+
+    def draw_overlay(
+        self, screen: Surface, font: pygame.font.Font
+    ) -> List[pygame.Rect]:
+        """Draws the slowest draw calls into the top right screen corner
+
+        :param screen: Target screen
+        :type screen: pygame.Surface
+        :param font: Overlay font
+        :type font: pygame.font.Font
+        :return: Drawn areas
+        :rtype: List[pygame.Rect]
+        """
+        rects: List[pygame.Rect] = []
+        y = 5
+        for label, t in self.slowest():
+            surface = font.render(f"{label} {t * 1000:.2f} ms", True, (255, 255, 255))
+            rect = surface.get_rect(topright=(screen.get_width() - 5, y))
+            rects.append(screen.blit(surface, rect))
+            y += rect.height + 5
+        return rects
+
+
+def get_draw_call_label(draw_call: Any) -> str:
+    """Creates readable label of a draw call
+
+    :param draw_call: Draw call
+    :type draw_call: Callable[[Surface, float], None]
+    :return: Type name with object id
+    :rtype: str
+    """
+    name = getattr(draw_call, "__name__", None) or type(draw_call).__name__
+    return f"{name}({getattr(draw_call, 'id', id(draw_call))})"
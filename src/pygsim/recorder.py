@@ -0,0 +1,248 @@
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from enum import Enum
+from multiprocessing import shared_memory
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pygame
+from pygame.surface import Surface
+
+
+class GRecordFormat(Enum):
+    """Frame recorder output format"""
+
+    PNG = 0
+    Video = 1
+
+
+# Frame buffers attached in the encoder worker process
+_worker_buffers: Dict[int, shared_memory.SharedMemory] = {}
+
+
+def _init_worker(names: List[str]) -> None:
+    # Buffers are owned and unlinked by the recording process
+    for slot, name in enumerate(names):
+        _worker_buffers[slot] = shared_memory.SharedMemory(name=name)
+
+
+def _encode_png(slot: int, size: Tuple[int, int], path: str) -> str:
+    image = pygame.image.frombuffer(_worker_buffers[slot].buf, size, "RGB")
+    pygame.image.save(image, path)
+    return path
+
+
+class GFrameRecorder:
+    """Records rendered frames as PNG sequence or video without blocking \
+        the simulation.
+
+    Each frame is copied once from the screen into a shared memory buffer, \
+        PNG frames are then encoded by a process pool. Video frames are piped \
+        into an ``ffmpeg`` process, which has to be available on the ``PATH``.
+
+    :param path: Output directory for PNG frames or output video file
+    :type path: str
+    :param record_format: Output format, defaults to GRecordFormat.PNG
+    :type record_format: GRecordFormat, optional
+    :param fps: Video frame rate, defaults to None (simulation frame rate)
+    :type fps: Optional[float], optional
+    :param workers: PNG encoder process count, defaults to None (CPU count)
+    :type workers: Optional[int], optional
+    :param buffers: Count of frames waiting for encoding before the capture \
+        blocks, defaults to 8
+    :type buffers: int, optional
+    :param codec: ``ffmpeg`` video codec, defaults to "libx264"
+    :type codec: str, optional
+    """
+
+    def __init__(
+        self,
+        path: str,
+        record_format: GRecordFormat = GRecordFormat.PNG,
+        fps: Optional[float] = None,
+        workers: Optional[int] = None,
+        buffers: int = 8,
+        codec: str = "libx264",
+    ) -> None:
+        self._path = path
+        self._format = self._set_format(record_format)
+        self._fps = fps
+        self._workers = workers
+        self._buffer_count = self._set_buffer_count(buffers)
+        self._codec = codec
+        self._size: Optional[Tuple[int, int]] = None
+        self._frame_count = 0
+
+        # PNG encoding
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._buffers: List[shared_memory.SharedMemory] = []
+        self._views: List[np.ndarray] = []
+        self._free: Deque[int] = deque()
+        self._pending: Deque[Tuple[Future, int]] = deque()
+
+        # Video encoding
+        self._process: Optional[subprocess.Popen] = None
+        self._frame: Optional[np.ndarray] = None
+
+        if self._format == GRecordFormat.Video and shutil.which("ffmpeg") is None:
+            raise ValueError("ffmpeg executable not found, required for video")
+
+    def __enter__(self) -> "GFrameRecorder":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    # Properities
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def record_format(self) -> GRecordFormat:
+        return self._format
+
+    @property
+    def frame_count(self) -> int:
+        return self._frame_count
+
+    @property
+    def is_open(self) -> bool:
+        return self._size is not None
+
+    # Main functionality
+
+    def open(self, size: Tuple[int, int], fps: float) -> None:
+        """Prepares encoders, called by the simulation when recorder is attached
+
+        :param size: Frame size
+        :type size: Tuple[int, int]
+        :param fps: Frame rate of recorded frames
+        :type fps: float
+        """
+        if self.is_open:
+            return
+
+        self._size = size
+        w, h = size
+
+        if self._format == GRecordFormat.PNG:
+            os.makedirs(self._path, exist_ok=True)
+            for slot in range(self._buffer_count):
+                buffer = shared_memory.SharedMemory(create=True, size=w * h * 3)
+                self._buffers.append(buffer)
+                self._views.append(np.ndarray((h, w, 3), np.uint8, buffer.buf))
+                self._free.append(slot)
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_init_worker,
+                initargs=([b.name for b in self._buffers],),
+            )
+        else:
+            self._frame = np.empty((h, w, 3), np.uint8)
+            self._process = subprocess.Popen(
+                [
+                    "ffmpeg",
+                    "-loglevel",
+                    "error",
+                    "-y",
+                    "-f",
+                    "rawvideo",
+                    "-pix_fmt",
+                    "rgb24",
+                    "-s",
+                    f"{w}x{h}",
+                    "-r",
+                    f"{self._fps if self._fps is not None else fps}",
+                    "-i",
+                    "-",
+                    "-c:v",
+                    self._codec,
+                    "-pix_fmt",
+                    "yuv420p",
+                    self._path,
+                ],
+                stdin=subprocess.PIPE,
+            )
+
+    def capture(self, screen: Surface) -> None:
+        """Captures current screen content
+
+        :param screen: Rendered screen
+        :type screen: pygame.Surface
+        :raises ValueError: When recorder is not open.
+        :raises ValueError: When screen size does not match recorded size.
+        """
+        if self._size is None:
+            raise ValueError("Recorder is not open")
+
+        if screen.get_size() != self._size:
+            raise ValueError("Screen size does not match recorded size")
+
+        if self._format == GRecordFormat.PNG:
+            self._collect(block=len(self._free) == 0)
+            slot = self._free.popleft()
+            self._copy_screen(screen, self._views[slot])
+            path = os.path.join(self._path, f"frame_{self._frame_count:06d}.png")
+            future = self._executor.submit(  # type: ignore
+                _encode_png, slot, self._size, path
+            )
+            self._pending.append((future, slot))
+        else:
+            self._copy_screen(screen, self._frame)  # type: ignore
+            self._process.stdin.write(self._frame.data)  # type: ignore
+
+        self._frame_count += 1
+
+    def close(self) -> None:
+        """Waits for all frames to be encoded and releases encoders"""
+        if self._executor is not None:
+            while self._pending:
+                self._collect(block=True)
+            self._executor.shutdown()
+            self._executor = None
+            self._views = []
+            for buffer in self._buffers:
+                buffer.close()
+                buffer.unlink()
+            self._buffers = []
+            self._free.clear()
+
+        if self._process is not None:
+            self._process.stdin.close()  # type: ignore
+            self._process.wait()
+            self._process = None
+            self._frame = None
+
+        self._size = None
+
+    # Helpers
+
+    def _copy_screen(self, screen: Surface, target: np.ndarray) -> None:
+        # Single copy from locked surface pixels into the frame buffer
+        pixels = pygame.surfarray.pixels3d(screen)
+        np.copyto(target, pixels.transpose(1, 0, 2))
+        del pixels
+
+    def _collect(self, block: bool) -> None:
+        while self._pending and (block or self._pending[0][0].done()):
+            future, slot = self._pending.popleft()
+            self._free.append(slot)
+            future.result()
+            block = False
+
+    def _set_format(self, f: GRecordFormat) -> GRecordFormat:
+        if not isinstance(f, GRecordFormat):
+            raise ValueError("Invalid record format type supplied")
+
+        return f
+
+    def _set_buffer_count(self, b: int) -> int:
+        if b <= 0:
+            raise ValueError("Zero or negative buffer count supplied")
+
+        return b
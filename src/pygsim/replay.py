@@ -0,0 +1,337 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+from bisect import bisect_right
+
+import numpy as np
+import pygame
+from pygame.surface import Surface
+
+from .core import GSimulation
+from .drawing import container as containers
+from .drawing.container import GAlign, GContainerBase, GFillDirection, GOverflow
+from .drawing.drawable import GDrawable
+from .drawing.shape import GShape, GShapeType
+from .trace import GTrace
+
+# Record index, object class and state by object id, members by container id
+Keyframe = Tuple[int, Dict[int, Tuple[int, int]], Dict[int, List[int]]]
+
+
+def get_shape_from_metadata(metadata: Dict[str, Any]) -> GShape:
+    """Creates shape described in trace metadata
+
+    :param metadata: Shape description
+    :type metadata: Dict[str, Any]
+    :rtype: GShape
+    """
+    return GShape(
+        GShapeType[metadata["shape_type"]],
+        metadata["size"],
+        metadata["border_size"],
+        pygame.Color(*metadata["color"]),
+    )
+
+
+class GReplayObject(GDrawable):
+    """Replayed simulation object, drawn by containers holding it in the color \
+        of its state
+
+    :param id: Id of the traced object
+    :type id: int
+    :param shape: Shape of the traced object class
+    :type shape: GShape
+    :param states: State names of the object class
+    :type states: List[str]
+    :param colors: State colors of the object class
+    :type colors: List[pygame.Color]
+    """
+
+    __slots__ = ("_id", "_states", "_colors", "_state")
+
+    def __init__(
+        self,
+        id: int,
+        shape: GShape,
+        states: List[str],
+        colors: List[pygame.Color],
+    ) -> None:
+        self._id = id
+        self._states = states
+        self._colors = colors
+        self._state = 0
+        super().__init__(shape)
+        self._shape.color = colors[0]
+
+    # Properities
+
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @property
+    def state(self) -> str:
+        """Name of the current state"""
+        return self._states[self._state]
+
+    # Main functionality
+
+    def set_state(self, index: int) -> None:
+        """Changes state by its index in the state mapper
+
+        :param index: State index
+        :type index: int
+        """
+        if index == self._state:
+            return
+        self._state = index
+        self._shape.color = self._colors[index]
+        self.mark_dirty()
+
+    def draw(self, screen: Surface, dt: float) -> None:
+        pass
+
+
+class GTraceViewer(GSimulation):
+    """Replays a recorded trace in the window without the simulation model
+
+    Containers entered during the recorded run are rebuilt from the trace \
+        metadata and filled with replayed objects in their recorded states. \
+        Replay time follows the simulation clock, so pausing and speed \
+        control work as in :class:`~pygsim.core.GSimulation`. Custom drawing \
+        of the recorded objects is not replayed, further drawables can be \
+        added to the viewer as to any simulation.
+
+    Keyframes of object states and container members are built at regular \
+        record intervals when the viewer is created. Seeking restores the \
+        nearest earlier keyframe and applies at most one interval of records.
+
+    Page down and page up keys seek forward and backward by ``seek_step``, \
+        home and end keys seek to the beginning and the end of the trace.
+
+    :param trace: Trace or path of a trace written by \
+        :class:`~pygsim.trace.GTraceWriter`
+    :type trace: Union[str, GTrace]
+    :param keyframe_interval: Count of records between keyframes, defaults \
+        to 65536
+    :type keyframe_interval: int, optional
+    :param seek_step: Replay time skipped by seeking keys, defaults to None \
+        (one hundredth of the trace duration)
+    :type seek_step: Optional[float], optional
+    :param kwargs: Arguments of :class:`~pygsim.core.GSimulation`
+    :type kwargs: Any
+    """
+
+    def __init__(
+        self,
+        trace: Union[str, GTrace],
+        keyframe_interval: int = 65536,
+        seek_step: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+
+        self._replayed = trace if isinstance(trace, GTrace) else GTrace(trace)
+        self._keyframe_interval = self._set_keyframe_interval(keyframe_interval)
+        self._seek_step = self._set_seek_step(
+            self._replayed.duration / 100 if seek_step is None else seek_step
+        )
+
+        self._classes = [
+            (
+                get_shape_from_metadata(c["shape"]),
+                c["states"],
+                [pygame.Color(*color) for color in c["colors"]],
+            )
+            for c in self._replayed.classes
+        ]
+        self._containers: Dict[int, GContainerBase] = {
+            c["id"]: self._create_container(c) for c in self._replayed.containers
+        }
+        self.add_drawables(self._containers.values())
+
+        self._objects: Dict[int, GReplayObject] = {}
+        self._cursor = 0
+        self._offset = self.now
+        self._keyframes = self._build_keyframes()
+        self._keyframe_indices = [k[0] for k in self._keyframes]
+
+        self._hud.add_item("t", lambda: self.replay_time, "{:.2f}")
+        self._hud.add_item("duration", lambda: self._replayed.duration, "{:.2f}")
+
+        self.process(self._replay())
+
+    # Properities
+
+    @property
+    def replayed(self) -> GTrace:
+        return self._replayed
+
+    @property
+    def replay_time(self) -> float:
+        """Time of the recorded run currently shown"""
+        return self.now - self._offset
+
+    @property
+    def objects(self) -> Dict[int, GReplayObject]:
+        """Living replayed objects by their recorded ids"""
+        return self._objects
+
+    @property
+    def containers(self) -> Dict[int, GContainerBase]:
+        """Rebuilt containers by their recorded ids"""
+        return self._containers
+
+    @property
+    def keyframe_count(self) -> int:
+        return len(self._keyframes)
+
+    # Main functionality
+
+    def seek(self, t: float) -> None:
+        """Shows the recorded run at the time
+
+        :param t: Replay time, clamped to the trace duration
+        :type t: float
+        """
+        t = min(max(t, 0.0), self._replayed.duration)
+        target = self._index(t)
+
+        keyframe = self._keyframes[bisect_right(self._keyframe_indices, target) - 1]
+        if not keyframe[0] <= self._cursor <= target:
+            self._restore(keyframe)
+            self._cursor = keyframe[0]
+        self._apply(self._replayed.records[self._cursor : target])
+        self._cursor = target
+
+        self._offset = self.now - t
+        self._full_repaint = True
+
+    # Helpers
+
+    def _replay(self):
+        records = self._replayed.records
+        while True:
+            target = self._index(self.replay_time)
+            if target > self._cursor:
+                self._apply(records[self._cursor : target])
+                self._cursor = target
+            yield self.timeout(self._frame_ticks)
+
+    def _index(self, t: float) -> int:
+        # Count of records up to and including the time
+        return int(np.searchsorted(self._replayed.time, t, side="right"))
+
+    def _apply(self, records: np.ndarray) -> None:
+        objects, containers = self._objects, self._containers
+        for _, obj, code, arg in records.tolist():
+            if code == 1:
+                o = objects.get(obj)
+                if o is not None:
+                    o.set_state(arg)
+            elif code == 2:
+                o, c = objects.get(obj), containers.get(arg)
+                if o is not None and c is not None:
+                    c.enter(o)
+            elif code == 3:
+                o, c = objects.get(obj), containers.get(arg)
+                if o is not None and c is not None and id(c) in o._owners:
+                    c.leave(o)
+            elif code == 0:
+                objects[obj] = GReplayObject(obj, *self._classes[arg])
+            elif code == 4:
+                o = objects.pop(obj, None)
+                if o is not None:
+                    for c in list(o._owners.values()):
+                        c.leave(o)  # type: ignore
+
+    def _build_keyframes(self) -> List[Keyframe]:
+        # Single pass over the trace tracking ids only, nothing is drawn
+        objects: Dict[int, Tuple[int, int]] = {}
+        members: Dict[int, Dict[int, None]] = {c: {} for c in self._containers}
+        keyframes: List[Keyframe] = [(0, {}, {c: [] for c in members})]
+
+        records = self._replayed.records
+        for start in range(0, len(records), self._keyframe_interval):
+            chunk = records[start : start + self._keyframe_interval]
+            for _, obj, code, arg in chunk.tolist():
+                if code == 1:
+                    if obj in objects:
+                        objects[obj] = (objects[obj][0], arg)
+                elif code == 2:
+                    if obj in objects and arg in members:
+                        members[arg][obj] = None
+                elif code == 3:
+                    if arg in members:
+                        members[arg].pop(obj, None)
+                elif code == 0:
+                    objects[obj] = (arg, 0)
+                elif code == 4:
+                    objects.pop(obj, None)
+                    for m in members.values():
+                        m.pop(obj, None)
+            keyframes.append(
+                (
+                    start + len(chunk),
+                    dict(objects),
+                    {c: list(m) for c, m in members.items()},
+                )
+            )
+
+        return keyframes
+
+    def _restore(self, keyframe: Keyframe) -> None:
+        for c in self._containers.values():
+            for o in list(c._objects.values()):
+                c.leave(o)
+
+        _, objects, members = keyframe
+        self._objects = {}
+        for obj, (cls, state) in objects.items():
+            o = GReplayObject(obj, *self._classes[cls])
+            o.set_state(state)
+            self._objects[obj] = o
+        for c, ids in members.items():
+            for obj in ids:
+                self._containers[c].enter(self._objects[obj])
+
+    def _create_container(self, metadata: Dict[str, Any]) -> GContainerBase:
+        return getattr(containers, metadata["type"])(
+            size=tuple(metadata["size"]),
+            position=tuple(metadata["position"]),
+            shape=get_shape_from_metadata(metadata["shape"]),
+            align=GAlign[metadata["align"]],
+            fill_direction=GFillDirection[metadata["fill_direction"]],
+            overflow=GOverflow[metadata["overflow"]],
+            padding=metadata["padding"],
+            spacing=metadata["spacing"],
+            reverse=metadata["reverse"],
+            labels=metadata.get("labels", True),
+        )
+
+    def _handle_event(self, event: pygame.event.Event) -> None:
+        if self._keyboard_control and event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_PAGEDOWN:
+                self.seek(self.replay_time + self._seek_step)
+                return
+            if event.key == pygame.K_PAGEUP:
+                self.seek(self.replay_time - self._seek_step)
+                return
+            if event.key == pygame.K_HOME:
+                self.seek(0.0)
+                return
+            if event.key == pygame.K_END:
+                self.seek(self._replayed.duration)
+                return
+
+        super()._handle_event(event)
+
+    def _set_keyframe_interval(self, k: int) -> int:
+        if k <= 0:
+            raise ValueError("Zero or negative keyframe interval supplied")
+
+        return k
+
+    def _set_seek_step(self, s: float) -> float:
+        if s < 0:
+            raise ValueError("Negative seek step supplied")
+
+        return s
@@ -0,0 +1,271 @@
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+import math
+import random
+
+import numpy as np
+
+from .core import GSimulation
+
+Metrics = Callable[[], Dict[str, float]]
+ModelBuilder = Callable[[int], Union[GSimulation, Tuple[GSimulation, Metrics]]]
+
+
+def get_engine_metrics(env: GSimulation) -> Dict[str, float]:
+    """Gets metrics every simulation provides
+
+    :param env: Finished simulation
+    :type env: GSimulation
+    :return: Simulation time and count of processed events
+    :rtype: Dict[str, float]
+    """
+    return {"time": float(env.now), "events": float(env.event_count)}
+
+
+def _run_replication(
+    builder: ModelBuilder, until: float, seed: int
+) -> Dict[str, float]:
+    # Models drawing from the global generators are seeded as well
+    random.seed(seed)
+    np.random.seed(seed)
+
+    model = builder(seed)
+    env, metrics = model if isinstance(model, tuple) else (model, None)
+
+    if not env.headless:
+        raise ValueError("Replications have to be run headless")
+
+    env.run(until=until)
+
+    values = get_engine_metrics(env)
+    if metrics is not None:
+        values.update(metrics())
+    return values
+
+
+def _t_quantile(p: float, df: int) -> float:
+    # Student's t quantile, bisection over numerically integrated density
+    scale = math.exp(
+        math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    )
+
+    def cdf(x: float) -> float:
+        t = np.linspace(0.0, x, 4097)
+        pdf = scale * (1 + t * t / df) ** (-(df + 1) / 2)
+        return 0.5 + float((pdf[:-1] + pdf[1:]).sum()) * (x / 4096) / 2
+
+    low, high = 0.0, 1.0
+    while cdf(high) < p:
+        low, high = high, high * 2
+    for _ in range(60):
+        mid = (low + high) / 2
+        if cdf(mid) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+class GReplicationSummary:
+    """Metrics of independent replications with their aggregates
+
+    :param seeds: Seed of every replication
+    :type seeds: List[int]
+    :param results: Metrics of every replication
+    :type results: List[Dict[str, float]]
+    :param confidence: Confidence level of intervals, defaults to 0.95
+    :type confidence: float, optional
+    """
+
+    def __init__(
+        self,
+        seeds: List[int],
+        results: List[Dict[str, float]],
+        confidence: float = 0.95,
+    ) -> None:
+        self._seeds = seeds
+        self._confidence = confidence
+        self._metrics: Dict[str, np.ndarray] = {
+            name: np.array([r.get(name, np.nan) for r in results], np.float64)
+            for name in dict.fromkeys(n for r in results for n in r)
+        }
+
+    def __len__(self) -> int:
+        return len(self._seeds)
+
+    # Properities
+
+    @property
+    def seeds(self) -> List[int]:
+        return self._seeds
+
+    @property
+    def confidence(self) -> float:
+        return self._confidence
+
+    @property
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """Values of every metric, ordered by replication"""
+        return self._metrics
+
+    # Main functionality
+
+    def mean(self, name: str) -> float:
+        """Mean of the metric over replications
+
+        :param name: Metric name
+        :type name: str
+        :rtype: float
+        """
+        return float(np.nanmean(self._metrics[name]))
+
+    def half_width(self, name: str) -> float:
+        """Half width of the metric mean confidence interval, based on \
+            Student's t-distribution
+
+        :param name: Metric name
+        :type name: str
+        :return: Half width, NaN for less than two replications
+        :rtype: float
+        """
+        values = self._metrics[name]
+        values = values[~np.isnan(values)]
+        if len(values) < 2:
+            return math.nan
+
+        t = _t_quantile((1 + self._confidence) / 2, len(values) - 1)
+        return t * float(values.std(ddof=1)) / math.sqrt(len(values))
+
+    def confidence_interval(self, name: str) -> Tuple[float, float]:
+        """Confidence interval of the metric mean
+
+        :param name: Metric name
+        :type name: str
+        :return: Lower and upper bound
+        :rtype: Tuple[float, float]
+        """
+        mean, half = self.mean(name), self.half_width(name)
+        return (mean - half, mean + half)
+
+    def aggregate(self) -> Dict[str, Tuple[float, float, float]]:
+        """Mean with confidence interval of every metric
+
+        :return: Mean, lower and upper bound keyed by metric name
+        :rtype: Dict[str, Tuple[float, float, float]]
+        """
+        return {
+            name: (self.mean(name),) + self.confidence_interval(name)
+            for name in self._metrics
+        }
+
+    def report(self) -> str:
+        """Human readable aggregates
+
+        :rtype: str
+        """
+        lines = [
+            f"Replications: {len(self)}, "
+            f"confidence intervals at {self._confidence:.0%}"
+        ]
+        for name, (mean, low, high) in self.aggregate().items():
+            lines.append(
+                f"{name:>24}: mean {mean:12.4g}, interval [{low:.4g}, {high:.4g}]"
+            )
+        return "\n".join(lines)
+
+
+class GReplicationRunner:
+    """Runs independent replications of a model in a process pool
+
+    The builder is called in a worker process with the replication seed, it \
+        creates a headless ``GSimulation`` with all its objects and returns it, \
+        optionally together with a callable returning model metrics after the \
+        run. The seed should be passed to ``GSimulation(seed=...)``, Python \
+        ``random`` and ``numpy.random`` global generators are seeded with it \
+        as well before the builder is called. The builder has to be \
+        picklable, e.g. a module level function.
+
+    :param builder: Model builder
+    :type builder: Callable[[int], Union[GSimulation, Tuple[GSimulation, \
+        Callable[[], Dict[str, float]]]]]
+    :param until: Simulation run length of each replication
+    :type until: float
+    :param replications: Count of replications, defaults to 10
+    :type replications: int, optional
+    :param seed: Root seed the replication seeds are spawned from, defaults \
+        to None (fresh entropy)
+    :type seed: Optional[int], optional
+    :param workers: Worker process count, defaults to None (CPU count)
+    :type workers: Optional[int], optional
+    :param confidence: Confidence level of intervals, defaults to 0.95
+    :type confidence: float, optional
+    """
+
+    def __init__(
+        self,
+        builder: ModelBuilder,
+        until: float,
+        replications: int = 10,
+        seed: Optional[int] = None,
+        workers: Optional[int] = None,
+        confidence: float = 0.95,
+    ) -> None:
+        self._builder = builder
+        self._until = self._set_until(until)
+        self._replications = self._set_replications(replications)
+        self._seeds = [
+            int(c.generate_state(1)[0])
+            for c in np.random.SeedSequence(seed).spawn(self._replications)
+        ]
+        self._workers = workers
+        self._confidence = self._set_confidence(confidence)
+
+    # Properities
+
+    @property
+    def replications(self) -> int:
+        return self._replications
+
+    @property
+    def seeds(self) -> List[int]:
+        """Independent seeds spawned from the root seed"""
+        return self._seeds
+
+    # Main functionality
+
+    def run(self) -> GReplicationSummary:
+        """Runs all replications
+
+        :return: Metrics of every replication with aggregates
+        :rtype: GReplicationSummary
+        """
+        seeds = self._seeds
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = [
+                executor.submit(_run_replication, self._builder, self._until, s)
+                for s in seeds
+            ]
+            results = [f.result() for f in futures]
+
+        return GReplicationSummary(seeds, results, self._confidence)
+
+    # Helpers
+
+    def _set_until(self, u: float) -> float:
+        if u <= 0:
+            raise ValueError("Zero or negative until supplied")
+
+        return u
+
+    def _set_replications(self, r: int) -> int:
+        if r <= 0:
+            raise ValueError("Zero or negative replication count supplied")
+
+        return r
+
+    def _set_confidence(self, c: float) -> float:
+        if not 0 < c < 1:
+            raise ValueError("Confidence has to be between 0 and 1")
+
+        return c
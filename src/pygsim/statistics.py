@@ -0,0 +1,327 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .drawing.color import GStateColorMapper, GStateColorMapperMeta
+
+
+class _GStateGroup:
+    """Streaming state times of objects sharing class and state mapper"""
+
+    def __init__(
+        self, states: GStateColorMapperMeta, per_object: bool, capacity: int = 64
+    ) -> None:
+        self.states: Tuple[GStateColorMapper, ...] = states._state_table  # type: ignore
+        self.per_object = per_object
+        self.totals = np.zeros(len(self.states), np.float64)
+        self.entries = np.zeros(len(self.states), np.int64)
+        # Living objects in every state
+        self.counts = np.zeros(len(self.states), np.int64)
+
+        # Keyed by object id
+        self.rows: Dict[int, int] = {}
+        self.free: List[int] = []
+        self.state = np.zeros(capacity, np.int32)
+        self.since = np.zeros(capacity, np.float64)
+        self.open = np.zeros(capacity, np.bool_)
+        self.object_totals = np.zeros(
+            (capacity if per_object else 0, len(self.states)), np.float64
+        )
+
+    def add(self, key: int, state: int, now: float) -> None:
+        if self.free:
+            row = self.free.pop()
+        else:
+            row = len(self.rows)
+            if row == len(self.open):
+                self._grow()
+        self.rows[key] = row
+        self.state[row] = state
+        self.since[row] = now
+        self.open[row] = True
+        self.entries[state] += 1
+        self.counts[state] += 1
+
+    def change(self, key: int, state: int, now: float) -> None:
+        row = self.rows[key]
+        if not self.open[row]:
+            return
+        self._accumulate(row, now)
+        self.counts[self.state[row]] -= 1
+        self.state[row] = state
+        self.entries[state] += 1
+        self.counts[state] += 1
+
+    def close(self, key: int, now: float) -> None:
+        row = self.rows.get(key)
+        if row is None or not self.open[row]:
+            return
+        self._accumulate(row, now)
+        self.open[row] = False
+        self.counts[self.state[row]] -= 1
+        if not self.per_object:
+            del self.rows[key]
+            self.free.append(row)
+
+    def live_totals(self, now: float) -> np.ndarray:
+        # Time of open intervals is added on read, not stored
+        used = slice(0, len(self.rows) + len(self.free))
+        open_ = self.open[used]
+        return self.totals + np.bincount(
+            self.state[used][open_],
+            weights=now - self.since[used][open_],
+            minlength=len(self.states),
+        )
+
+    def live_object_totals(self, key: int, now: float) -> np.ndarray:
+        row = self.rows[key]
+        totals = self.object_totals[row].copy()
+        if self.open[row]:
+            totals[self.state[row]] += now - self.since[row]
+        return totals
+
+    def _accumulate(self, row: int, now: float) -> None:
+        spent = now - self.since[row]
+        state = self.state[row]
+        self.totals[state] += spent
+        if self.per_object:
+            self.object_totals[row, state] += spent
+        self.since[row] = now
+
+    def _grow(self) -> None:
+        extra = len(self.open)
+        self.state = np.concatenate([self.state, np.zeros(extra, np.int32)])
+        self.since = np.concatenate([self.since, np.zeros(extra, np.float64)])
+        self.open = np.concatenate([self.open, np.zeros(extra, np.bool_)])
+        if self.per_object:
+            self.object_totals = np.concatenate(
+                [self.object_totals, np.zeros_like(self.object_totals)]
+            )
+
+
+class GStateStatistics:
+    """Time-weighted state occupancy of simulation objects
+
+    Collects time spent in every state of every \
+        :class:`~pygsim.core.GSimulationObject` while attached to a \
+        simulation via ``env.statistics``. Only running totals are kept, \
+        per class and optionally per object, individual transitions are \
+        not stored. Objects are observed from their creation or from the \
+        first state change after attaching, until their life cycle ends. \
+        State changes of finished objects are not measured.
+
+    Live summaries can be shown in the HUD:
+
+    ``env.hud.add_item("checkouts", lambda: stats.describe(CheckoutObject))``
+
+    :param per_object: Keep totals of every object, otherwise only per \
+        class totals are kept and memory is bounded by living objects, \
+        defaults to True
+    :type per_object: bool, optional
+    """
+
+    def __init__(self, per_object: bool = True) -> None:
+        self._per_object = per_object
+        self._clock: Callable[[], float] = lambda: 0.0
+        self._groups: Dict[Tuple[type, GStateColorMapperMeta], _GStateGroup] = {}
+        # Object id to its group
+        self._objects: Dict[int, _GStateGroup] = {}
+
+    # Properities
+
+    @property
+    def per_object(self) -> bool:
+        return self._per_object
+
+    @property
+    def classes(self) -> List[type]:
+        """Classes of observed objects"""
+        return list(dict.fromkeys(cls for cls, _ in self._groups))
+
+    # Recording
+
+    def attach(self, clock: Callable[[], float]) -> None:
+        """Sets simulation time source, called by the simulation
+
+        :param clock: Callable returning current simulation time
+        :type clock: Callable[[], float]
+        """
+        self._clock = clock
+
+    def observe(self, obj: Any) -> None:
+        """Starts measuring time of the object in its current state
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        """
+        key = (type(obj), obj.states)
+        group = self._groups.get(key)
+        if group is None:
+            group = _GStateGroup(obj.states, self._per_object)
+            self._groups[key] = group
+        group.add(obj.id, obj.current_state._state_index, self._clock())
+        self._objects[obj.id] = group
+
+    def change(self, obj: Any, state: GStateColorMapper) -> None:
+        """Closes the time spent in the current state of the object and \
+            starts measuring the new one
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        :param state: New state
+        :type state: GStateColorMapper
+        """
+        group = self._objects.get(obj.id)
+        if group is None:
+            # Closed objects are forgotten without per object totals
+            if obj.finished:
+                return
+            self.observe(obj)
+            group = self._objects[obj.id]
+        group.change(obj.id, state._state_index, self._clock())  # type: ignore
+
+    def close(self, obj: Any) -> None:
+        """Stops measuring time of the object
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        """
+        group = self._objects.get(obj.id)
+        if group is None:
+            return
+        group.close(obj.id, self._clock())
+        if not self._per_object:
+            del self._objects[obj.id]
+
+    # Statistics
+
+    def totals(
+        self, cls: type, states: Optional[GStateColorMapperMeta] = None
+    ) -> Dict[GStateColorMapper, float]:
+        """Time spent in every state by all objects of the class
+
+        :param cls: Object class
+        :type cls: type
+        :param states: State mapper, defaults to None (the only mapper \
+            used by the class)
+        :type states: Optional[GStateColorMapperMeta], optional
+        :rtype: Dict[GStateColorMapper, float]
+        """
+        group = self._get_group(cls, states)
+        return dict(zip(group.states, group.live_totals(self._clock()).tolist()))
+
+    def occupancy(
+        self, cls: type, states: Optional[GStateColorMapperMeta] = None
+    ) -> Dict[GStateColorMapper, float]:
+        """Fraction of time spent in every state by objects of the class, \
+            e.g. utilization of checkouts
+
+        :param cls: Object class
+        :type cls: type
+        :param states: State mapper, defaults to None (the only mapper \
+            used by the class)
+        :type states: Optional[GStateColorMapperMeta], optional
+        :return: Fractions summing up to 1, zeros before any time passed
+        :rtype: Dict[GStateColorMapper, float]
+        """
+        group = self._get_group(cls, states)
+        totals = group.live_totals(self._clock())
+        total = totals.sum()
+        fractions = totals / total if total > 0 else totals
+        return dict(zip(group.states, fractions.tolist()))
+
+    def entries(
+        self, cls: type, states: Optional[GStateColorMapperMeta] = None
+    ) -> Dict[GStateColorMapper, int]:
+        """Count of times objects of the class entered every state
+
+        :param cls: Object class
+        :type cls: type
+        :param states: State mapper, defaults to None (the only mapper \
+            used by the class)
+        :type states: Optional[GStateColorMapperMeta], optional
+        :rtype: Dict[GStateColorMapper, int]
+        """
+        group = self._get_group(cls, states)
+        return dict(zip(group.states, group.entries.tolist()))
+
+    def counts(self) -> Dict[type, Dict[GStateColorMapper, int]]:
+        """Count of living objects in every state, by class, kept up to date \
+            with every state change
+
+        :rtype: Dict[type, Dict[GStateColorMapper, int]]
+        """
+        counts: Dict[type, Dict[GStateColorMapper, int]] = {}
+        for (cls, _), group in self._groups.items():
+            counts.setdefault(cls, {}).update(zip(group.states, group.counts.tolist()))
+        return counts
+
+    def object_totals(self, obj: Any) -> Dict[GStateColorMapper, float]:
+        """Time spent in every state by the object
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        :rtype: Dict[GStateColorMapper, float]
+        """
+        if not self._per_object:
+            raise ValueError("Per object totals are not collected")
+
+        group = self._objects.get(obj.id)
+        if group is None:
+            raise ValueError("Object is not observed")
+
+        totals = group.live_object_totals(obj.id, self._clock())
+        return dict(zip(group.states, totals.tolist()))
+
+    def describe(
+        self, cls: type, states: Optional[GStateColorMapperMeta] = None
+    ) -> str:
+        """Short occupancy summary of the class, e.g. for a HUD line
+
+        :param cls: Object class
+        :type cls: type
+        :param states: State mapper, defaults to None (the only mapper \
+            used by the class)
+        :type states: Optional[GStateColorMapperMeta], optional
+        :rtype: str
+        """
+        if not any(c is cls for c, _ in self._groups):
+            return "-"
+        occupancy = self.occupancy(cls, states)
+        return ", ".join(f"{s.name} {f:.0%}" for s, f in occupancy.items())
+
+    def report(self) -> str:
+        """Human readable occupancy of every observed class
+
+        :rtype: str
+        """
+        now = self._clock()
+        lines = [f"State occupancy at t = {now:.2f}"]
+        for (cls, _), group in self._groups.items():
+            totals = group.live_totals(now)
+            total = totals.sum()
+            lines.append(f"{cls.__name__}:")
+            for state, t, n in zip(group.states, totals, group.entries):
+                share = t / total if total > 0 else 0.0
+                lines.append(
+                    f"{state.name:>24}: {t:12.4g} time, {share:7.1%}, {n} entries"
+                )
+        return "\n".join(lines)
+
+    # Helpers
+
+    def _get_group(
+        self, cls: type, states: Optional[GStateColorMapperMeta]
+    ) -> _GStateGroup:
+        if states is not None:
+            group = self._groups.get((cls, states))
+            if group is None:
+                raise ValueError("No objects of the class with the states observed")
+            return group
+
+        groups = [g for (c, _), g in self._groups.items() if c is cls]
+        if not groups:
+            raise ValueError("No objects of the class observed")
+        if len(groups) > 1:
+            raise ValueError("Objects of the class use several state mappers")
+        return groups[0]
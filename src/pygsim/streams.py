@@ -0,0 +1,183 @@
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+from collections import OrderedDict
+
+import numpy as np
+
+
+class GSampler:
+    """Draws scalars from a distribution of a generator in batches
+
+    :param generator: Source generator
+    :type generator: np.random.Generator
+    :param distribution: Name of the generator distribution method, \
+        e.g. "exponential"
+    :type distribution: str
+    :param args: Distribution arguments
+    :type args: Tuple[Any, ...]
+    :param batch_size: Count of values drawn at once, defaults to 1024
+    :type batch_size: int, optional
+    """
+
+    def __init__(
+        self,
+        generator: np.random.Generator,
+        distribution: str,
+        args: Tuple[Any, ...],
+        batch_size: int = 1024,
+    ) -> None:
+        self._method = self._set_distribution(generator, distribution)
+        self._args = args
+        self._batch_size = self._set_batch_size(batch_size)
+        self._values = self._draw()
+
+    def __call__(self) -> Any:
+        return next(self._values)
+
+    # Properities
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    # Helpers
+
+    def _draw(self) -> Iterator[Any]:
+        while True:
+            yield from self._method(*self._args, size=self._batch_size).tolist()
+
+    def _set_distribution(
+        self, generator: np.random.Generator, d: str
+    ) -> Callable[..., np.ndarray]:
+        method = getattr(generator, d, None)
+        if method is None or d.startswith("_"):
+            raise ValueError(f"Invalid distribution {d} supplied")
+
+        return method
+
+    def _set_batch_size(self, b: int) -> int:
+        if b <= 0:
+            raise ValueError("Zero or negative batch size supplied")
+
+        return b
+
+
+class GRandomStreams:
+    """Independent random streams of a simulation
+
+    Every stream is a ``numpy.random.Generator`` seeded with a child of \
+        the root ``numpy.random.SeedSequence``. Children are spawned in \
+        the order streams are requested, so the same model built the same \
+        way draws the same numbers.
+
+    :param seed: Root seed, defaults to None (drawn from the global \
+        ``numpy.random`` state, so ``numpy.random.seed`` still reproduces runs)
+    :type seed: Optional[int], optional
+    :param max_samplers: Count of kept samplers, the least recently used \
+        ones are dropped with their drawn batches, defaults to 256
+    :type max_samplers: int, optional
+    """
+
+    def __init__(self, seed: Optional[int] = None, max_samplers: int = 256) -> None:
+        # Explicit dtype, the default integer is 32 bit on some platforms
+        self._root = np.random.SeedSequence(
+            np.random.randint(0, 2**32, 4, dtype=np.uint32).tolist()
+            if seed is None
+            else seed
+        )
+        self._generators: Dict[Hashable, np.random.Generator] = {}
+        self._max_samplers = self._set_max_samplers(max_samplers)
+        self._samplers: "OrderedDict[Hashable, GSampler]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._generators)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._generators
+
+    # Properities
+
+    @property
+    def entropy(self) -> Any:
+        """Root seed entropy, reproduces the streams when used as seed"""
+        return self._root.entropy
+
+    # Main functionality
+
+    def spawn(self) -> np.random.Generator:
+        """Creates new independent generator, not shared by any key
+
+        :rtype: np.random.Generator
+        """
+        return np.random.default_rng(self._root.spawn(1)[0])
+
+    def generator(self, key: Hashable) -> np.random.Generator:
+        """Gets generator of the key, e.g. an object class
+
+        :param key: Stream key
+        :type key: Hashable
+        :rtype: np.random.Generator
+        """
+        generator = self._generators.get(key)
+        if generator is None:
+            generator = self.spawn()
+            self._generators[key] = generator
+        return generator
+
+    def sampler(
+        self, key: Hashable, distribution: str, *args: Any, batch_size: int = 1024
+    ) -> GSampler:
+        """Gets batched sampler of the distribution, shared by the same key, \
+            distribution and arguments
+
+        Every distinct set of arguments gets its own sampler, arguments \
+            changing with every draw, e.g. time dependent rates, should be \
+            drawn from :func:`generator` instead.
+
+        >>> streams = GRandomStreams(seed=1)
+        >>> walk = streams.sampler("walk", "integers", 1, 5)
+        >>> 1 <= walk() < 5
+        True
+
+        :param key: Stream key
+        :type key: Hashable
+        :param distribution: Name of the ``numpy.random.Generator`` \
+            distribution method
+        :type distribution: str
+        :param args: Distribution arguments
+        :type args: Any
+        :param batch_size: Count of values drawn at once, defaults to 1024
+        :type batch_size: int, optional
+        :rtype: GSampler
+        """
+        sampler_key = (key, distribution, args)
+        sampler = self._samplers.get(sampler_key)
+        if sampler is not None:
+            self._samplers.move_to_end(sampler_key)
+            return sampler
+
+        sampler = GSampler(self.spawn(), distribution, args, batch_size)
+        self._samplers[sampler_key] = sampler
+        if len(self._samplers) > self._max_samplers:
+            self._samplers.popitem(last=False)
+        return sampler
+
+    def draw(self, key: Hashable, distribution: str, *args: Any) -> Any:
+        """Draws single value from the batched sampler
+
+        :param key: Stream key
+        :type key: Hashable
+        :param distribution: Name of the ``numpy.random.Generator`` \
+            distribution method
+        :type distribution: str
+        :param args: Distribution arguments
+        :type args: Any
+        """
+        return self.sampler(key, distribution, *args)()
+
+    # Helpers
+
+    def _set_max_samplers(self, m: int) -> int:
+        if m <= 0:
+            raise ValueError("Zero or negative count of samplers supplied")
+
+        return m
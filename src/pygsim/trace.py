@@ -0,0 +1,422 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from enum import Enum
+import json
+import os
+
+import numpy as np
+
+from .drawing.color import GStateColorMapper, GStateColorMapperMeta
+from .drawing.container import GContainerBase
+from .drawing.shape import GShape
+
+# Fixed width trace record, 24 bytes
+TRACE_DTYPE = np.dtype(
+    [("time", "<f8"), ("object", "<i8"), ("code", "<i4"), ("arg", "<i4")]
+)
+
+
+class GTraceEvent(Enum):
+    """Trace record code, meaning of the record argument in comments"""
+
+    # Class index in the trace metadata
+    Create = 0
+    # State index in the state mapper of the object class
+    State = 1
+    # Container id
+    Enter = 2
+    # Container id
+    Leave = 3
+    # Argument unused
+    Finish = 4
+
+
+def get_metadata_path(path: str) -> str:
+    """Gets path of the JSON metadata stored next to a trace
+
+    :param path: Trace file path
+    :type path: str
+    :rtype: str
+    """
+    return os.path.splitext(path)[0] + ".json"
+
+
+def get_shape_metadata(shape: GShape) -> Dict[str, Any]:
+    """Describes the shape for trace metadata
+
+    :param shape: Described shape
+    :type shape: GShape
+    :rtype: Dict[str, Any]
+    """
+    return {
+        "shape_type": shape.shape_type.name,
+        "size": shape.size,
+        "border_size": shape.border_size,
+        "color": tuple(shape.color),
+    }
+
+
+class GTraceWriter:
+    """Records state changes of simulation objects and their container moves
+
+    Records of :data:`TRACE_DTYPE` are collected in memory and written in \
+        chunks into a preallocated, memory-mapped ``.npy`` file, which grows \
+        by doubling. After :func:`close` the file holds exactly the written \
+        records and can be loaded with ``numpy.load(path, mmap_mode="r")`` or \
+        :class:`GTrace`. Object classes with their states and shapes, and \
+        layouts of entered containers are stored in JSON metadata next to \
+        the trace.
+
+    Attached to a simulation via ``env.trace``, it has to be closed after \
+        the run, e.g. by using the writer as a context manager.
+
+    :param path: Output ``.npy`` file
+    :type path: str
+    :param chunk_size: Count of records written at once, defaults to 65536
+    :type chunk_size: int, optional
+    :param capacity: Count of preallocated records, defaults to None \
+        (16 chunks)
+    :type capacity: Optional[int], optional
+    """
+
+    def __init__(
+        self, path: str, chunk_size: int = 65536, capacity: Optional[int] = None
+    ) -> None:
+        self._path = path
+        self._chunk_size = self._set_chunk_size(chunk_size)
+        self._capacity = self._set_capacity(
+            chunk_size * 16 if capacity is None else capacity
+        )
+        self._clock: Optional[Callable[[], float]] = None
+        self._pending: List[Tuple[float, int, int, int]] = []
+        self._count = 0
+        self._header_size = 0
+        self._records: Optional[np.memmap] = None
+
+        # Keyed by object class and its state mapper
+        self._classes: Dict[Tuple[type, GStateColorMapperMeta], int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        # Keyed by container id
+        self._containers: Dict[int, Dict[str, Any]] = {}
+
+    def __enter__(self) -> "GTraceWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count + len(self._pending)
+
+    # Properities
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def is_open(self) -> bool:
+        return self._records is not None
+
+    # Main functionality
+
+    def open(self, clock: Callable[[], float]) -> None:
+        """Preallocates the trace file, called by the simulation when \
+            the writer is attached
+
+        :param clock: Callable returning current simulation time
+        :type clock: Callable[[], float]
+        """
+        self._clock = clock
+        if self.is_open:
+            return
+
+        with open(self._path, "wb") as f:
+            self._write_header(f, self._capacity)
+            self._header_size = f.tell()
+        self._map(self._capacity)
+
+    def close(self) -> None:
+        """Writes pending records, truncates the file to the written records \
+            and stores the metadata"""
+        if not self.is_open:
+            return
+
+        self._flush()
+        self._records.flush()  # type: ignore
+        self._records = None
+
+        with open(self._path, "r+b") as f:
+            self._write_header(f, self._count)
+            f.truncate(self._header_size + self._count * TRACE_DTYPE.itemsize)
+
+        with open(get_metadata_path(self._path), "w") as f:
+            json.dump(
+                {
+                    "records": self._count,
+                    "classes": self._metadata,
+                    "containers": list(self._containers.values()),
+                },
+                f,
+            )
+
+    # Recording, codes are GTraceEvent values without enum lookups
+
+    def created(self, obj: Any) -> None:
+        """Records creation of the object with its initial state
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        """
+        key = (type(obj), obj.states)
+        index = self._classes.get(key)
+        if index is None:
+            index = self._add_class(*key, obj.shape)
+        now = self._clock()  # type: ignore
+        self._pending.append((now, obj.id, 0, index))
+        self._pending.append((now, obj.id, 1, obj.current_state._state_index))
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    def state_changed(self, obj: Any, state: GStateColorMapper) -> None:
+        """Records state change of the object
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        :param state: New state
+        :type state: GStateColorMapper
+        """
+        self._pending.append(
+            (self._clock(), obj.id, 1, state._state_index)  # type: ignore
+        )
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    def entered(self, obj: Any, container: Any) -> None:
+        """Records the object entering the container
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        :param container: Entered container
+        :type container: GContainerBase
+        """
+        if container.id not in self._containers:
+            self._add_container(container)
+        self._pending.append((self._clock(), obj.id, 2, container.id))  # type: ignore
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    def left(self, obj: Any, container: Any) -> None:
+        """Records the object leaving the container
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        :param container: Left container
+        :type container: GContainerBase
+        """
+        self._pending.append((self._clock(), obj.id, 3, container.id))  # type: ignore
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    def finished(self, obj: Any) -> None:
+        """Records end of the object life cycle
+
+        :param obj: Simulation object
+        :type obj: GSimulationObject
+        """
+        self._pending.append((self._clock(), obj.id, 4, 0))  # type: ignore
+        if len(self._pending) >= self._chunk_size:
+            self._flush()
+
+    # Helpers
+
+    def _add_class(
+        self, cls: type, states: GStateColorMapperMeta, shape: GShape
+    ) -> int:
+        index = len(self._metadata)
+        self._classes[(cls, states)] = index
+        self._metadata.append(
+            {
+                "name": cls.__name__,
+                "states": [s.name for s in states._state_table],  # type: ignore
+                "colors": [tuple(c) for c in states._color_table],  # type: ignore
+                "shape": get_shape_metadata(shape),
+            }
+        )
+        return index
+
+    def _add_container(self, container: GContainerBase) -> None:
+        # Custom containers are replayed as their library base class
+        base = next(
+            c
+            for c in type(container).__mro__
+            if c.__module__ == GContainerBase.__module__
+        )
+        self._containers[container.id] = {
+            "id": container.id,
+            "type": base.__name__,
+            "size": list(container.size),
+            "position": list(container.position),
+            "shape": get_shape_metadata(container.shape),
+            "align": container.align.name,
+            "fill_direction": container.fill_direction.name,
+            "overflow": container.overflow.name,
+            "padding": container.padding,
+            "spacing": container.spacing,
+            "reverse": container.reverse,
+            "labels": container.labels,
+        }
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+
+        end = self._count + len(self._pending)
+        if end > self._capacity:
+            self._grow(end)
+        self._records[self._count : end] = np.array(  # type: ignore
+            self._pending, TRACE_DTYPE
+        )
+        self._count = end
+        self._pending.clear()
+
+    def _grow(self, required: int) -> None:
+        self._records.flush()  # type: ignore
+        self._records = None
+        self._capacity = max(required, self._capacity * 2)
+
+        with open(self._path, "r+b") as f:
+            self._write_header(f, self._capacity)
+            f.truncate(self._header_size + self._capacity * TRACE_DTYPE.itemsize)
+        self._map(self._capacity)
+
+    def _map(self, capacity: int) -> None:
+        self._records = np.memmap(
+            self._path,
+            TRACE_DTYPE,
+            mode="r+",
+            offset=self._header_size,
+            shape=(capacity,),
+        )
+
+    def _write_header(self, f: Any, count: int) -> None:
+        # Header length does not depend on the count, it is rewritten in place
+        f.seek(0)
+        np.lib.format.write_array_header_1_0(
+            f,
+            {
+                "descr": np.lib.format.dtype_to_descr(TRACE_DTYPE),
+                "fortran_order": False,
+                "shape": (count,),
+            },
+        )
+
+    def _set_chunk_size(self, c: int) -> int:
+        if c <= 0:
+            raise ValueError("Zero or negative chunk size supplied")
+
+        return c
+
+    def _set_capacity(self, c: int) -> int:
+        if c <= 0:
+            raise ValueError("Zero or negative capacity supplied")
+
+        return c
+
+
+class GTrace:
+    """Recorded trace mapped into memory without copying
+
+    :param path: Trace file written by :class:`GTraceWriter`
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._records: np.ndarray = np.load(path, mmap_mode="r")
+        if self._records.dtype != TRACE_DTYPE:
+            raise ValueError("File is not a simulation trace")
+
+        with open(get_metadata_path(path)) as f:
+            self._metadata: Dict[str, Any] = json.load(f)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    # Properities
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def records(self) -> np.ndarray:
+        """All records of :data:`TRACE_DTYPE`"""
+        return self._records
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._records["time"]
+
+    @property
+    def object(self) -> np.ndarray:
+        return self._records["object"]
+
+    @property
+    def code(self) -> np.ndarray:
+        return self._records["code"]
+
+    @property
+    def arg(self) -> np.ndarray:
+        return self._records["arg"]
+
+    @property
+    def classes(self) -> List[Dict[str, Any]]:
+        """Name, state names, state colors and shape of every traced class"""
+        return self._metadata["classes"]
+
+    @property
+    def containers(self) -> List[Dict[str, Any]]:
+        """Type and layout settings of every entered container"""
+        return self._metadata["containers"]
+
+    @property
+    def duration(self) -> float:
+        """Time of the last record"""
+        if len(self._records) == 0:
+            return 0.0
+        return float(self._records["time"][-1])
+
+    # Main functionality
+
+    def index(self, t: float) -> int:
+        """Gets count of records before the time
+
+        :param t: Simulation time
+        :type t: float
+        :rtype: int
+        """
+        return int(np.searchsorted(self._records["time"], t, side="left"))
+
+    def between(self, start: float, end: float) -> np.ndarray:
+        """Records from start time up to, not including, end time
+
+        :param start: Start simulation time
+        :type start: float
+        :param end: End simulation time
+        :type end: float
+        :rtype: np.ndarray
+        """
+        return self._records[self.index(start) : self.index(end)]
+
+    def select(self, code: GTraceEvent) -> np.ndarray:
+        """Records of the event type
+
+        :param code: Event type
+        :type code: GTraceEvent
+        :rtype: np.ndarray
+        """
+        return self._records[self._records["code"] == code.value]
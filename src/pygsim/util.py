@@ -2,6 +2,8 @@ import re
 from PIL import ImageColor
 from typing import Tuple, Any, List, TypeVar
 
+import pygame
+
 
 def clamp(num, min_value, max_value):
     """Will clamp value between two numbers
@@ -66,3 +68,22 @@ def array_chunks(arr: List[T], n: int):
     """
     for i in range(0, len(arr), n):
         yield arr[i : i + n]
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Merges overlapping rectangles together
+
+    :param rects: Rectangles
+    :type rects: List[pygame.Rect]
+    :return: Non overlapping rectangles
+    :rtype: List[pygame.Rect]
+    """
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        rect = rect.copy()
+        i = rect.collidelist(merged)
+        while i != -1:
+            rect.union_ip(merged.pop(i))
+            i = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
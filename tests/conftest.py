@@ -0,0 +1,4 @@
+import os
+
+# Windowed simulations open no window while testing
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
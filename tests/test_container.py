@@ -0,0 +1,83 @@
+import pygame
+import pytest
+
+from pygsim.core import GSimulation, GSimulationObject
+from pygsim.drawing import GContainerRow, GShape, GShapeType, GStateColorMapper
+
+
+class ItemState(GStateColorMapper):
+    Waiting = 0
+    Served = 1
+
+
+class Item(GSimulationObject):
+    States = ItemState  # type: ignore
+
+    def life_cycle(self):
+        yield self._env.timeout(1)
+
+    def draw(self, screen, dt):
+        pass
+
+
+@pytest.fixture
+def env():
+    pygame.init()
+    return GSimulation(headless=True, render_every=0)
+
+
+def circle(size):
+    return GShape(GShapeType.Circle, size, -1, (255, 255, 255))
+
+
+def test_sizes_follow_enter_and_leave(env):
+    container = GContainerRow((500, 100), (0, 0))
+    small, big, other_big = (Item(env, shape=circle(s)) for s in (10, 30, 30))
+
+    for item in (small, big, other_big):
+        container.enter(item)
+    assert container.max_object_size == 30
+    assert container.total_object_size == 70
+
+    container.leave(big)
+    assert container.max_object_size == 30
+    container.leave(other_big)
+    assert container.max_object_size == 10
+    assert container.total_object_size == 10
+
+    container.leave(small)
+    assert container.max_object_size == 0
+    assert container.total_object_size == 0
+
+
+def test_sizes_follow_shape_change(env):
+    container = GContainerRow((500, 100), (0, 0))
+    small, big = Item(env, shape=circle(10)), Item(env, shape=circle(30))
+    container.enter(small)
+    container.enter(big)
+
+    small.shape = circle(50)
+    assert container.max_object_size == 50
+    assert container.total_object_size == 80
+
+    small.shape = circle(5)
+    assert container.max_object_size == 30
+    assert container.total_object_size == 35
+
+
+def test_state_counts_follow_state_change(env):
+    container = GContainerRow((500, 100), (0, 0))
+    first, second = Item(env), Item(env)
+    container.enter(first)
+    container.enter(second)
+    assert container.state_counts == {ItemState.Waiting: 2}
+
+    first.current_state = ItemState.Served
+    assert container.state_counts == {ItemState.Waiting: 1, ItemState.Served: 1}
+
+    container.leave(second)
+    assert container.state_counts == {ItemState.Served: 1}
+
+    first.current_state = ItemState.Waiting
+    container.leave(first)
+    assert container.state_counts == {}
@@ -0,0 +1,150 @@
+import asyncio
+
+import pygame
+
+from pygsim.core import GSimulation, GSimulationObject, GSimulationSpeed
+from pygsim.drawing.color import GStateColorMapper
+from pygsim.drawing.shape import GShape, GShapeType
+
+
+def test_repeated_run_keeps_single_frame_loop():
+    env = GSimulation(headless=True, fps=30)
+
+    env.run(until=10)
+    loop = env._frame_loop
+    env.run(until=20)
+    env.run(until=30)
+
+    assert env._frame_loop is loop
+    assert env.process_count == 1
+    # 30 frames per simulation second, not more with every run
+    assert abs(env.frame_count - 900) <= 1
+
+
+def test_repeated_run_async_keeps_single_frame_loop():
+    env = GSimulation(headless=True, fps=30)
+
+    asyncio.run(env.run_async(until=10))
+    asyncio.run(env.run_async(until=20))
+
+    assert env.process_count == 1
+    assert abs(env.frame_count - 600) <= 1
+
+
+def test_stats_sampled_while_debug_hidden():
+    env = GSimulation(headless=True, fps=30, debug_show=False)
+    env.hud.refresh_interval = 0
+
+    env.run(until=10)
+
+    assert env.measured_fps > 0
+    assert env.events_per_second > 0
+    assert env.speed_ratio > 0
+
+
+def test_unchanged_debug_text_not_blitted_over_itself():
+    env = GSimulation(headless=True, debug_show=True, dirty_rendering=True)
+    env.hud.add_item("label", lambda: "constant text")
+    env.hud.refresh_interval = 1e9
+
+    env._process_draw_calls(0.0)
+    first = pygame.surfarray.array3d(env.screen)
+    for _ in range(10):
+        env._process_draw_calls(0.0)
+
+    assert (pygame.surfarray.array3d(env.screen) == first).all()
+
+
+def test_slowing_down_wakes_frame_loop():
+    env = GSimulation(headless=True, fps=30, simulation_speed=1000)
+    frames = []
+
+    def slow_down(env):
+        yield env.timeout(110)
+        env.simulation_speed = GSimulationSpeed.Real
+        frames.append(env.frame_count)
+
+    env.process(slow_down(env))
+    env.run(until=111)
+
+    # A frame of the old speed was due 33 simulation seconds later
+    assert env.frame_count - frames[0] >= 29
+
+
+def test_pause_resumes_by_keyboard():
+    env = GSimulation(realtime=False, fps=30)
+
+    def pause(env):
+        yield env.timeout(5)
+        env.pause()
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+
+    env.process(pause(env))
+    env.run(until=10)
+
+    assert env.now == 10
+    assert not env.paused
+
+
+class PooledState(GStateColorMapper):
+    Waiting = 0
+    Served = 1
+
+
+class PooledObject(GSimulationObject):
+    States = PooledState  # type: ignore
+    PoolSize = 10
+
+    def life_cycle(self):
+        yield self._env.timeout(1)
+        self.current_state = PooledState.Served
+
+    def draw(self, screen, dt):
+        pass
+
+
+def test_pooled_object_reused_by_same_simulation():
+    env = GSimulation(headless=True, render_every=0)
+    other = GSimulation(headless=True, render_every=0)
+    first = PooledObject(env)
+    env.run(until=2)
+
+    assert PooledObject.pooled(env) == 1
+    assert PooledObject.pooled(other) == 0
+    assert PooledObject(other) is not first
+    assert PooledObject(env) is first
+    assert PooledObject.pooled(env) == 0
+
+
+def test_pooled_object_reset_in_place():
+    env = GSimulation(headless=True, render_every=0)
+    first = PooledObject(env, shape=GShape(GShapeType.Circle, 20, -1, (255, 0, 0)))
+    shape = first.shape
+    first.shape.size = 40
+    env.run(until=2)
+
+    square = GShape(GShapeType.Square, 30, -1, (0, 255, 0))
+    second = PooledObject(env, shape=square)
+
+    assert second is first
+    assert second.shape is shape
+    assert second.shape is not square
+    assert (shape.shape_type, shape.size, shape.color) == (
+        GShapeType.Square,
+        30,
+        (0, 255, 0),
+    )
+    assert second.current_state is PooledState.Waiting
+    assert second.dirty
+
+
+def test_repeated_fast_forward_draws_no_frames():
+    env = GSimulation(headless=True, fps=30)
+
+    env.run(until=10)
+    frames = env.frame_count
+    env.run(until=30, fast_forward_until=20)
+
+    assert env.process_count == 1
+    # Only frames after the fast forward are drawn
+    assert abs(env.frame_count - frames - 300) <= 1
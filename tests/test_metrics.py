@@ -0,0 +1,74 @@
+import json
+import socket
+from threading import Thread
+
+from pygsim.core import GSimulation
+from pygsim.metrics import GMetricsServer, format_json, format_prometheus
+
+
+def test_prometheus_values_keep_precision():
+    samples = [
+        ("pygsim_events_total", {}, 2**53 + 1),
+        ("pygsim_time", {}, 1234567.125),
+        ("pygsim_lag_seconds", {}, float("nan")),
+        ("pygsim_speed_ratio", {}, float("-inf")),
+        ("pygsim_container_objects", {"container": 'a"b'}, 3),
+    ]
+
+    lines = format_prometheus(samples).splitlines()
+
+    assert "# TYPE pygsim_events_total counter" in lines
+    assert "# TYPE pygsim_time gauge" in lines
+    assert "pygsim_events_total 9007199254740993" in lines
+    assert "pygsim_time 1234567.125" in lines
+    assert "pygsim_lag_seconds NaN" in lines
+    assert "pygsim_speed_ratio -Inf" in lines
+    assert 'pygsim_container_objects{container="a\\"b"} 3' in lines
+
+
+def test_json_groups_samples_by_name():
+    samples = [
+        ("pygsim_objects", {"state": "A"}, 1),
+        ("pygsim_objects", {"state": "B"}, 2),
+    ]
+
+    assert json.loads(format_json(samples)) == {
+        "pygsim_objects": [
+            {"labels": {"state": "A"}, "value": 1},
+            {"labels": {"state": "B"}, "value": 2},
+        ]
+    }
+
+
+def test_silent_client_does_not_block_poll():
+    env = GSimulation(headless=True, render_every=0)
+    env.metrics = GMetricsServer(port=0)
+    host, port = env.metrics.address
+
+    with socket.create_connection((host, port)):
+        poll = Thread(target=env.metrics.poll, daemon=True)
+        poll.start()
+        poll.join(timeout=2)
+        assert not poll.is_alive()
+
+    with socket.create_connection((host, port), timeout=5) as client:
+        client.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+        env.metrics.poll()
+        response = client.makefile("rb").read()
+    assert b"pygsim_time 0.0" in response
+
+    env.metrics = None
+
+
+def test_replaced_server_is_closed():
+    env = GSimulation(headless=True, render_every=0)
+    first = GMetricsServer(port=0)
+    second = GMetricsServer(port=0)
+
+    env.metrics = first
+    env.metrics = second
+    assert not first.is_open
+    assert second.is_open
+
+    env.metrics = None
+    assert not second.is_open
@@ -0,0 +1,24 @@
+import pygame
+
+from pygsim.drawing import GShape, GShapeType, GStampCache
+
+
+def test_stamp_accepts_any_color_form():
+    cache = GStampCache()
+    colors = [pygame.Color(255, 0, 0), (255, 0, 0), (255, 0, 0, 255), "red"]
+
+    stamps = [cache.stamp(GShape(GShapeType.Square, 4, -1, c)) for c in colors]
+
+    assert all(s is stamps[0] for s in stamps)
+    assert len(cache) == 1
+    assert stamps[0].get_at((0, 0))[:3] == (255, 0, 0)
+
+
+def test_circle_stamp_is_transparent_outside():
+    cache = GStampCache()
+
+    stamp = cache.stamp(GShape(GShapeType.Circle, 20, -1, (0, 0, 0)))
+
+    assert stamp.get_at((10, 10))[:3] == (0, 0, 0)
+    assert stamp.get_colorkey()[:3] != (0, 0, 0)
+    assert stamp.get_at((0, 0))[:3] == stamp.get_colorkey()[:3]
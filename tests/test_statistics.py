@@ -0,0 +1,98 @@
+import pytest
+
+from pygsim.core import GSimulation, GSimulationObject
+from pygsim.drawing import GStateColorMapper
+from pygsim.statistics import GStateStatistics
+
+
+class ServerState(GStateColorMapper):
+    Idle = 0
+    Busy = 1
+
+
+class Server(GSimulationObject):
+    States = ServerState  # type: ignore
+
+    def __init__(self, env, busy_at, lifetime):
+        self._busy_at = busy_at
+        self._lifetime = lifetime
+        super().__init__(env)
+
+    def life_cycle(self):
+        if self._busy_at >= self._lifetime:
+            yield self._env.timeout(self._lifetime)
+            return
+        yield self._env.timeout(self._busy_at)
+        self.current_state = ServerState.Busy
+        yield self._env.timeout(self._lifetime - self._busy_at)
+
+    def draw(self, screen, dt):
+        pass
+
+
+def simulation(per_object):
+    env = GSimulation(headless=True, render_every=0)
+    env.statistics = GStateStatistics(per_object=per_object)
+    return env
+
+
+@pytest.mark.parametrize("per_object", [True, False])
+def test_totals_and_counts(per_object):
+    env = simulation(per_object)
+    Server(env, busy_at=2, lifetime=20)
+    Server(env, busy_at=6, lifetime=20)
+    env.run(until=10)
+
+    stats = env.statistics
+    assert stats.totals(Server) == {ServerState.Idle: 8.0, ServerState.Busy: 12.0}
+    assert stats.entries(Server) == {ServerState.Idle: 2, ServerState.Busy: 2}
+    assert stats.counts() == {Server: {ServerState.Idle: 0, ServerState.Busy: 2}}
+    assert stats.occupancy(Server) == {ServerState.Idle: 0.4, ServerState.Busy: 0.6}
+
+
+@pytest.mark.parametrize("per_object", [True, False])
+def test_finished_object_not_counted(per_object):
+    env = simulation(per_object)
+    server = Server(env, busy_at=5, lifetime=1)
+    env.run(until=2)
+
+    assert server.finished
+    server.current_state = ServerState.Busy
+    env.run(until=10)
+
+    stats = env.statistics
+    assert stats.totals(Server) == {ServerState.Idle: 1.0, ServerState.Busy: 0.0}
+    assert stats.counts() == {Server: {ServerState.Idle: 0, ServerState.Busy: 0}}
+
+
+def test_object_totals():
+    env = simulation(True)
+    server = Server(env, busy_at=3, lifetime=4)
+    env.run(until=10)
+
+    assert env.statistics.object_totals(server) == {
+        ServerState.Idle: 3.0,
+        ServerState.Busy: 1.0,
+    }
+
+
+def test_object_totals_require_per_object():
+    env = simulation(False)
+    server = Server(env, busy_at=3, lifetime=4)
+    env.run(until=10)
+
+    with pytest.raises(ValueError):
+        env.statistics.object_totals(server)
+
+
+def test_change_observes_object_created_before_attaching():
+    env = GSimulation(headless=True, render_every=0)
+    server = Server(env, busy_at=5, lifetime=10)
+    env.run(until=1)
+    env.statistics = GStateStatistics()
+    env.run(until=8)
+
+    assert env.statistics.object_totals(server) == {
+        ServerState.Idle: 0.0,
+        ServerState.Busy: 3.0,
+    }
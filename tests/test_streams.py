@@ -0,0 +1,41 @@
+import numpy as np
+
+from pygsim.streams import GRandomStreams
+
+
+def draws(streams, key="arrivals"):
+    return streams.generator(key).random(5).tolist()
+
+
+def test_same_seed_draws_same_numbers():
+    assert draws(GRandomStreams(seed=7)) == draws(GRandomStreams(seed=7))
+    assert draws(GRandomStreams(seed=7)) != draws(GRandomStreams(seed=8))
+
+
+def test_unseeded_streams_follow_global_seed():
+    np.random.seed(3)
+    first = draws(GRandomStreams())
+    np.random.seed(3)
+
+    assert draws(GRandomStreams()) == first
+
+
+def test_entropy_reproduces_unseeded_streams():
+    streams = GRandomStreams()
+
+    assert draws(GRandomStreams(seed=streams.entropy)) == draws(streams)
+
+
+def test_streams_of_keys_are_independent():
+    streams = GRandomStreams(seed=1)
+
+    assert draws(streams, "a") != draws(streams, "b")
+    assert len(streams) == 2
+
+
+def test_sampler_cache_is_bounded():
+    streams = GRandomStreams(seed=1, max_samplers=4)
+    for rate in range(100):
+        streams.draw("service", "exponential", rate + 1.0)
+
+    assert len(streams._samplers) == 4